@@ -3,8 +3,16 @@ Model Configuration for TTS Engine
 Defines model paths and configuration constants.
 """
 
+import os
 from pathlib import Path
 
+# CUDA environment tuning - must be set before torch is imported anywhere
+# in the process. Lazy module loading defers kernel loads to first use,
+# cutting device memory and first-inference latency; a single device
+# connection keeps kernel launches ordered for low-latency streaming.
+os.environ.setdefault("CUDA_MODULE_LOADING", "LAZY")
+os.environ.setdefault("CUDA_DEVICE_MAX_CONNECTIONS", "1")
+
 # Base paths
 BASE_DIR = Path(__file__).parent.parent
 MODELS_DIR = BASE_DIR / "models"
@@ -27,7 +35,10 @@ FIRST_CHUNK_SIZE_MS = 60  # Optimized: Best balance of latency and stability
 SUBSEQUENT_CHUNK_SIZE_MS = 60  # Optimized: Consistent chunk size for stability
 LOW_LATENCY_MODE = True  # Enable low-latency optimizations
 USE_FP16_ON_CUDA = True  # Use FP16 mixed precision on CUDA for 1.5-2x speedup
+# CUDA_MODULE_LOADING=LAZY (set above) pairs with this: kernels load on
+# demand instead of all at context creation, shrinking VRAM and cold start
 USE_TORCH_COMPILE = True  # Use torch.compile for faster inference (PyTorch 2.0+)
+MPS_MAX_TOKENS = 256  # Longest input run on MPS directly; longer texts are sentence-split
 OPTIMIZE_CHUNK_SIZE = 5  # Smaller chunks for faster first response (words)
 
 # Chunk Size Optimization
@@ -4,44 +4,111 @@ Supports both MPS (Apple Silicon) for local testing and CUDA (NVIDIA) for deploy
 """
 
 import logging
-from typing import Literal
-
-import torch
+from functools import lru_cache
+from typing import Literal, Optional
 
 logger = logging.getLogger(__name__)
 
 DeviceType = Literal["cuda", "mps", "cpu"]
 
 
+@lru_cache(maxsize=1)
+def _cuda_available() -> bool:
+    """Probe CUDA availability once per process (first call triggers lazy CUDA init)."""
+    import torch
+    return torch.cuda.is_available()
+
+
+@lru_cache(maxsize=1)
+def _mps_available() -> bool:
+    """Probe MPS (Apple Silicon) availability once per process."""
+    import torch
+    return hasattr(torch.backends, "mps") and torch.backends.mps.is_available()
+
+
+@lru_cache(maxsize=1)
+def _cuda_count() -> int:
+    """Cached CUDA device count."""
+    import torch
+    return torch.cuda.device_count()
+
+
+@lru_cache(maxsize=1)
+def _cuda_name() -> str:
+    """Cached name of the first CUDA device."""
+    import torch
+    return torch.cuda.get_device_name(0) if _cuda_count() > 0 else "Unknown"
+
+# Cached result of the first get_optimal_device() call.
+# torch is imported lazily inside the functions below so that code paths
+# that never touch PyTorch (gTTS fallback, health checks, language
+# detection) don't pay the multi-second torch import on startup.
+_cached_device: Optional[tuple[DeviceType, str]] = None
+
+
 def get_optimal_device() -> tuple[DeviceType, str]:
     """
     Detect and return the optimal device for PyTorch operations.
-    
+
     Priority:
     1. CUDA (NVIDIA GPU) - for deployment (H100, etc.)
     2. MPS (Apple Silicon) - for local testing (M1/M2/M3 Mac)
     3. CPU - fallback
-    
+
+    The result is cached: only the first call imports torch and probes
+    devices; subsequent calls return the cached tuple.
+
     Returns:
         Tuple of (device_type, device_string)
         - device_type: "cuda", "mps", or "cpu"
         - device_string: PyTorch device string (e.g., "cuda:0", "mps", "cpu")
     """
+    global _cached_device
+
+    if _cached_device is not None:
+        return _cached_device
+
     # Check for CUDA (NVIDIA GPU) - Priority 1 (for deployment)
-    if torch.cuda.is_available():
-        device_count = torch.cuda.device_count()
-        device_name = torch.cuda.get_device_name(0) if device_count > 0 else "Unknown"
-        logger.info(f"✅ CUDA available: {device_name} ({device_count} device(s))")
-        return "cuda", "cuda:0"
-    
+    if _cuda_available():
+        logger.info(f"✅ CUDA available: {_cuda_name()} ({_cuda_count()} device(s))")
+        _cached_device = ("cuda", "cuda:0")
     # Check for MPS (Apple Silicon) - Priority 2 (for local testing)
-    if hasattr(torch.backends, "mps") and torch.backends.mps.is_available():
+    elif _mps_available():
         logger.info("✅ MPS available: Apple Silicon GPU (for local testing)")
-        return "mps", "mps"
-    
-    # Fallback to CPU
-    logger.warning("⚠️  No GPU available. Using CPU (slower performance).")
-    return "cpu", "cpu"
+        _cached_device = ("mps", "mps")
+    else:
+        # Fallback to CPU
+        logger.warning("⚠️  No GPU available. Using CPU (slower performance).")
+        _cached_device = ("cpu", "cpu")
+
+    return _cached_device
+
+
+def warmup_device(inference_func, sample_text: str = "अ", language: str = "mr") -> None:
+    """
+    Warm up the device with dummy inference calls.
+
+    The first (and sometimes second) CUDA inference is 10-100x slower than
+    steady state due to lazy context init, cuDNN algorithm selection, and
+    allocator growth. Running two dummy inferences up front moves that cost
+    out of the first user-visible packet.
+
+    Args:
+        inference_func: Function(text, language) -> (waveform, sample_rate)
+        sample_text: Short dummy text to synthesize
+        language: Language code for the dummy inference
+    """
+    try:
+        for _ in range(2):
+            inference_func(sample_text, language)
+
+        if _cuda_available():
+            import torch
+            torch.cuda.synchronize()
+
+        logger.info("[Device] Warmup complete (2 dummy inferences)")
+    except Exception as e:
+        logger.warning(f"[Device] Warmup failed: {e}")
 
 
 def get_device_info() -> dict:
@@ -52,22 +119,24 @@ def get_device_info() -> dict:
         Dictionary with device information
     """
     info = {
-        "cuda_available": torch.cuda.is_available(),
-        "mps_available": hasattr(torch.backends, "mps") and torch.backends.mps.is_available() if hasattr(torch.backends, "mps") else False,
+        "cuda_available": _cuda_available(),
+        "mps_available": _mps_available(),
         "optimal_device": None,
         "device_type": None,
         "device_details": {}
     }
-    
-    if torch.cuda.is_available():
+
+    if _cuda_available():
+        import torch
+
         info["optimal_device"] = "cuda:0"
         info["device_type"] = "cuda"
         info["device_details"] = {
-            "device_count": torch.cuda.device_count(),
-            "device_name": torch.cuda.get_device_name(0),
+            "device_count": _cuda_count(),
+            "device_name": _cuda_name(),
             "cuda_version": torch.version.cuda,
         }
-    elif hasattr(torch.backends, "mps") and torch.backends.mps.is_available():
+    elif _mps_available():
         info["optimal_device"] = "mps"
         info["device_type"] = "mps"
         info["device_details"] = {
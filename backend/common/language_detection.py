@@ -4,8 +4,17 @@ Automatically detects language from text to prevent mismatches.
 """
 
 import logging
-import re
-from typing import Literal, Optional
+from functools import lru_cache
+from typing import Literal, Optional, Tuple
+
+import numpy as np
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    logging.warning("[LangDetect] pyahocorasick not available, using substring scans")
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +22,13 @@ logger = logging.getLogger(__name__)
 GUJARATI_RANGE = (0x0A80, 0x0AFF)
 MARATHI_RANGE = (0x0900, 0x097F)  # Devanagari (shared with Hindi, but we can detect context)
 
+# Below this length the UTF-32 encode costs more than the plain Python loop
+_VECTORIZE_MIN_CHARS = 32
+
+# Prefix length for the short-circuit probe in detect_language: the two
+# script ranges never overlap, so a single-script prefix decides the text
+_PROBE_CHARS = 256
+
 # Common words/phrases for each language
 GUJARATI_MARKERS = [
     'આ', 'એ', 'અને', 'તે', 'આવે', 'જાય', 'છે', 'હતું', 'હશે',
@@ -25,34 +41,144 @@ MARATHI_MARKERS = [
 ]
 
 
+def _build_marker_automaton():
+    """Build a single Aho-Corasick automaton over all markers at import time."""
+    automaton = ahocorasick.Automaton()
+    for marker in GUJARATI_MARKERS:
+        automaton.add_word(marker, ('gu', marker))
+    for marker in MARATHI_MARKERS:
+        automaton.add_word(marker, ('mr', marker))
+    automaton.make_automaton()
+    return automaton
+
+
+_MARKER_AUTOMATON = _build_marker_automaton() if AHOCORASICK_AVAILABLE else None
+
+# Dep-free fallback scans markers individually (C-level str.__contains__);
+# deduplicated up front so repeated list entries can't double-count
+_GU_MARKERS_UNIQUE = tuple(dict.fromkeys(GUJARATI_MARKERS))
+_MR_MARKERS_UNIQUE = tuple(dict.fromkeys(MARATHI_MARKERS))
+
+
+def _count_markers(text: str) -> Tuple[int, int]:
+    """
+    Count distinct Gujarati and Marathi word markers present in text.
+
+    Each marker contributes at most once, no matter how often it occurs -
+    counting occurrences would let one repeated word outvote the script
+    scoring. With pyahocorasick this is one linear DFA pass over the text
+    (hits collapsed into a set); otherwise one substring scan per marker.
+    Markers are Indic script, so no case folding is needed.
+
+    Args:
+        text: Input text to scan
+
+    Returns:
+        Tuple of (gujarati_markers_found, marathi_markers_found)
+    """
+    if _MARKER_AUTOMATON is not None:
+        seen = set()
+        for _, item in _MARKER_AUTOMATON.iter(text):
+            seen.add(item)
+        gu = sum(1 for lang, _ in seen if lang == 'gu')
+        return gu, len(seen) - gu
+
+    return (
+        sum(1 for marker in _GU_MARKERS_UNIQUE if marker in text),
+        sum(1 for marker in _MR_MARKERS_UNIQUE if marker in text),
+    )
+
+
+def _count_script_chars(text: str) -> Tuple[int, int]:
+    """
+    Count Gujarati and Devanagari codepoints in text.
+
+    Uses a vectorized NumPy pass over the UTF-32 codepoint buffer for long
+    inputs; falls back to a plain Python loop for short strings where the
+    encoding overhead dominates.
+
+    Args:
+        text: Input text to scan
+
+    Returns:
+        Tuple of (gujarati_chars, marathi_chars)
+    """
+    if len(text) < _VECTORIZE_MIN_CHARS:
+        gujarati_chars = 0
+        marathi_chars = 0
+        for char in text:
+            code_point = ord(char)
+            if GUJARATI_RANGE[0] <= code_point <= GUJARATI_RANGE[1]:
+                gujarati_chars += 1
+            elif MARATHI_RANGE[0] <= code_point <= MARATHI_RANGE[1]:
+                marathi_chars += 1
+        return gujarati_chars, marathi_chars
+
+    # Single C-level pass: encode once, then vectorized range comparisons
+    arr = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    gujarati_chars = int(((arr >= GUJARATI_RANGE[0]) & (arr <= GUJARATI_RANGE[1])).sum())
+    marathi_chars = int(((arr >= MARATHI_RANGE[0]) & (arr <= MARATHI_RANGE[1])).sum())
+    return gujarati_chars, marathi_chars
+
+
+def script_of(text: str) -> Optional[Literal["gu", "mr"]]:
+    """
+    Cheap script classification: the first Indic codepoint decides.
+
+    MMS-TTS tokenizers are deterministic given the script, so callers that
+    just need to pick a model can stop at the first Gujarati or Devanagari
+    character instead of scanning and scoring the whole text.
+
+    Args:
+        text: Input text to classify
+
+    Returns:
+        'gu' or 'mr' from the first in-range codepoint, None if neither
+        script appears
+    """
+    for char in text:
+        code_point = ord(char)
+        if GUJARATI_RANGE[0] <= code_point <= GUJARATI_RANGE[1]:
+            return "gu"
+        if MARATHI_RANGE[0] <= code_point <= MARATHI_RANGE[1]:
+            return "mr"
+    return None
+
+
+@lru_cache(maxsize=1024)
 def detect_language(text: str) -> Optional[Literal["gu", "mr"]]:
     """
     Detect language from text using script analysis and word markers.
-    
+
+    Results are memoized: packet streaming re-runs detection for every
+    packet, and telecom/IVR workloads repeat the same prompts often.
+
     Args:
         text: Input text to analyze
-        
+
     Returns:
         Detected language code ('gu' or 'mr') or None if uncertain
     """
     if not text or not text.strip():
         return None
-    
+
+    # Fast path: probe the leading codepoints first. Gujarati (0x0A80-0x0AFF)
+    # and Devanagari (0x0900-0x097F) never collide, so a single-script prefix
+    # decides long texts in O(1) instead of scanning every codepoint.
+    if len(text) > _PROBE_CHARS:
+        probe_gu, probe_mr = _count_script_chars(text[:_PROBE_CHARS])
+        if probe_gu > 0 and probe_mr == 0:
+            logger.debug(f"[LangDetect] Detected Gujarati via prefix probe: {probe_gu} chars")
+            return "gu"
+        if probe_mr > 0 and probe_gu == 0:
+            logger.debug(f"[LangDetect] Detected Marathi via prefix probe: {probe_mr} chars")
+            return "mr"
+
     # Count characters in each script range
-    gujarati_chars = 0
-    marathi_chars = 0
-    
-    for char in text:
-        code_point = ord(char)
-        if GUJARATI_RANGE[0] <= code_point <= GUJARATI_RANGE[1]:
-            gujarati_chars += 1
-        elif MARATHI_RANGE[0] <= code_point <= MARATHI_RANGE[1]:
-            marathi_chars += 1
-    
-    # Count word markers
-    text_lower = text.lower()
-    gujarati_markers_found = sum(1 for marker in GUJARATI_MARKERS if marker in text_lower)
-    marathi_markers_found = sum(1 for marker in MARATHI_MARKERS if marker in text_lower)
+    gujarati_chars, marathi_chars = _count_script_chars(text)
+
+    # Count word markers (single DFA pass when pyahocorasick is available)
+    gujarati_markers_found, marathi_markers_found = _count_markers(text)
     
     # Decision logic
     if gujarati_chars > 0 and marathi_chars == 0:
@@ -5,10 +5,21 @@ Ensures constant latency regardless of text size.
 """
 
 import logging
+import queue
+import threading
 import time
-from typing import Generator, Tuple
+from functools import lru_cache
+from math import gcd
+from typing import Generator, List, Optional, Tuple
 import numpy as np
 
+try:
+    from scipy.signal import resample_poly
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+    logging.warning("[PacketStream] scipy not available, falling back to linear resampling")
+
 from backend.common.smart_chunking import SmartChunker
 from backend.common.config import DEFAULT_SAMPLE_RATE, FIRST_CHUNK_SIZE_MS, SUBSEQUENT_CHUNK_SIZE_MS
 from backend.common.streaming import wav_to_chunks, normalize_audio
@@ -16,6 +27,42 @@ from backend.common.streaming import wav_to_chunks, normalize_audio
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _get_chunker(words_per_packet: int) -> SmartChunker:
+    """Shared SmartChunker per packet size - built once per process, not per request."""
+    return SmartChunker(max_words=words_per_packet)
+
+
+def _resample(waveform: np.ndarray, sr: int, target_sr: int) -> np.ndarray:
+    """
+    Resample waveform from sr to target_sr.
+
+    Uses scipy's polyphase FIR (resample_poly) when available - vectorized C
+    with far better fidelity than linear interpolation. Falls back to
+    np.interp when scipy is not installed.
+
+    Args:
+        waveform: Input audio samples
+        sr: Source sample rate
+        target_sr: Target sample rate
+
+    Returns:
+        Resampled waveform as float32
+    """
+    if SCIPY_AVAILABLE:
+        g = gcd(sr, target_sr)
+        return resample_poly(waveform, target_sr // g, sr // g).astype(np.float32)
+
+    # Fallback: simple linear interpolation
+    ratio = target_sr / sr
+    new_length = int(len(waveform) * ratio)
+    return np.interp(
+        np.linspace(0, len(waveform), new_length),
+        np.arange(len(waveform)),
+        waveform
+    ).astype(np.float32)
+
+
 class PacketStreamingGenerator:
     """
     Generates TTS audio in packets with constant latency.
@@ -32,47 +79,99 @@ class PacketStreamingGenerator:
         inference_func,
         sample_rate: int = DEFAULT_SAMPLE_RATE,
         words_per_packet: int = 5,
-        packet_overlap_words: int = 1
+        packet_overlap_words: int = 1,
+        batched_inference_func=None,
+        batch_size: int = 4
     ):
         """
         Initialize packet streaming generator.
-        
+
         Args:
             inference_func: Function(text, language) -> (waveform, sample_rate)
             sample_rate: Target sample rate
             words_per_packet: Number of words per text packet (smaller = faster first packet)
             packet_overlap_words: Words to overlap between packets for smooth transitions
+            batched_inference_func: Optional function(list[str], language) ->
+                list[(waveform, sample_rate)] for batched GPU inference.
+                When set, packets after the first are run in batches on a
+                background thread so GPU compute overlaps with streaming.
+            batch_size: Number of packets per batched inference call
         """
         self.inference_func = inference_func
+        self.batched_inference_func = batched_inference_func
+        self.batch_size = batch_size
         self.sample_rate = sample_rate
-        self.chunker = SmartChunker(max_words=words_per_packet)
+        self.chunker = _get_chunker(words_per_packet)
         self.packet_overlap_words = packet_overlap_words
+        # Reusable scratch/output buffers for float->int16 conversion, grown
+        # to the largest packet seen so steady state does zero allocations
+        self._scratch_f32: Optional[np.ndarray] = None
+        self._int16_buf: Optional[np.ndarray] = None
         
         logger.info(
             f"[PacketStream] Initialized: words_per_packet={words_per_packet}, "
             f"overlap={packet_overlap_words}, sample_rate={sample_rate}"
         )
     
+    def to_int16(self, waveform: np.ndarray) -> np.ndarray:
+        """
+        Convert a float waveform to int16 with explicit clipping.
+
+        Plain `(waveform * 32767).astype(np.int16)` silently wraps samples
+        above 1.0 into negative values and allocates two temporaries. This
+        multiplies and clips in-place into a reused scratch buffer and casts
+        into a pooled int16 buffer, so steady-state packets allocate nothing.
+
+        The returned array is a view into the pooled buffer and is only valid
+        until the next to_int16 call on this generator.
+
+        Args:
+            waveform: Audio samples (float or int16)
+
+        Returns:
+            int16 waveform (view into the pooled buffer)
+        """
+        if waveform.dtype == np.int16:
+            return waveform
+
+        n = len(waveform)
+        if self._scratch_f32 is None or len(self._scratch_f32) < n:
+            self._scratch_f32 = np.empty(n, dtype=np.float32)
+        if self._int16_buf is None or len(self._int16_buf) < n:
+            self._int16_buf = np.empty(n, dtype=np.int16)
+
+        scratch = self._scratch_f32[:n]
+        np.multiply(waveform, 32767.0, out=scratch)
+        np.clip(scratch, -32768.0, 32767.0, out=scratch)
+
+        out = self._int16_buf[:n]
+        out[:] = scratch
+        return out
+
     def generate_packets(
         self,
         text: str,
-        language: str
+        language: str,
+        text_packets: Optional[List[str]] = None
     ) -> Generator[Tuple[np.ndarray, int], None, None]:
         """
         Generate audio packets from text with constant first-packet latency.
-        
+
         Args:
             text: Full text to synthesize
             language: Language code
-            
+            text_packets: Pre-chunked text packets (optional, avoids re-chunking
+                when the caller has already split the text)
+
         Yields:
             Tuples of (waveform, sample_rate) for each packet
         """
         if not text or not text.strip():
             return
-        
+
         # Split text into packets (small chunks for fast processing)
-        text_packets = self.chunker.split_text(text)
+        if text_packets is None:
+            text_packets = self.chunker.split_text(text)
         
         if not text_packets:
             logger.warning("[PacketStream] No packets generated from text")
@@ -91,6 +190,13 @@ class PacketStreamingGenerator:
             f"Last packet preview: '{text_packets[-1][:50]}...'"
         )
         
+        # Batched path: first packet still runs solo (constant first-packet
+        # latency); the rest run as batches on a background thread so GPU
+        # compute overlaps with WAV framing and network sends
+        if self.batched_inference_func is not None and len(text_packets) > 1:
+            yield from self._generate_packets_batched(text_packets, language)
+            return
+
         # Process each packet independently and yield immediately
         packets_yielded = 0
         for i, packet_text in enumerate(text_packets):
@@ -115,16 +221,9 @@ class PacketStreamingGenerator:
                 # Normalize audio
                 waveform = normalize_audio(waveform)
                 
-                # Ensure correct sample rate
+                # Ensure correct sample rate (polyphase FIR when scipy available)
                 if sr != self.sample_rate:
-                    # Simple resampling (for production, use proper resampling)
-                    ratio = self.sample_rate / sr
-                    new_length = int(len(waveform) * ratio)
-                    waveform = np.interp(
-                        np.linspace(0, len(waveform), new_length),
-                        np.arange(len(waveform)),
-                        waveform
-                    )
+                    waveform = _resample(waveform, sr, self.sample_rate)
                 
                 packet_time = (time.time() - packet_start) * 1000
                 logger.info(
@@ -157,91 +256,198 @@ class PacketStreamingGenerator:
                 f"Missing {len(text_packets) - packets_yielded} packet(s)"
             )
 
+    def _postprocess(self, waveform: np.ndarray, sr: int) -> np.ndarray:
+        """Normalize and resample a raw inference waveform to the target rate."""
+        waveform = normalize_audio(waveform)
+        if sr != self.sample_rate:
+            waveform = _resample(waveform, sr, self.sample_rate)
+        return waveform
+
+    def _generate_packets_batched(
+        self,
+        text_packets: List[str],
+        language: str
+    ) -> Generator[Tuple[np.ndarray, int], None, None]:
+        """
+        Generate packets with batched inference for packets after the first.
+
+        Packet 1 runs through the single-packet inference_func so first-packet
+        latency is unchanged; packets 2..N are grouped into batches and run by
+        batched_inference_func on a background thread. A size-1 queue keeps at
+        most one batch in flight, so the GPU works while audio for the
+        previous batch is being streamed.
+
+        Args:
+            text_packets: Pre-filtered non-empty text packets
+            language: Language code
+
+        Yields:
+            Tuples of (waveform, sample_rate) for each packet
+        """
+        results_q: queue.Queue = queue.Queue(maxsize=1)
+        cancelled = threading.Event()
+
+        def _put(item) -> bool:
+            # Timed put: if the consumer abandons the generator (a client
+            # disconnect raises GeneratorExit at the yield), a plain
+            # blocking put on the full size-1 queue would strand this
+            # thread and its batch of waveforms forever
+            while not cancelled.is_set():
+                try:
+                    results_q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _worker():
+            try:
+                for start in range(1, len(text_packets), self.batch_size):
+                    if cancelled.is_set():
+                        return
+                    batch = [p.strip() for p in text_packets[start:start + self.batch_size]]
+                    results = self.batched_inference_func(batch, language)
+                    if not _put(("batch", results)):
+                        return
+                _put(("done", None))
+            except Exception as e:
+                _put(("error", e))
+
+        worker = threading.Thread(target=_worker, daemon=True)
+        worker.start()
+
+        packets_yielded = 0
+
+        try:
+            # First packet: solo inference, yielded as soon as it's ready
+            try:
+                waveform, sr = self.inference_func(text_packets[0].strip(), language)
+                if waveform is not None and len(waveform) > 0:
+                    yield self._postprocess(waveform, sr), self.sample_rate
+                    packets_yielded += 1
+                else:
+                    logger.warning("[PacketStream] Empty waveform for first packet, skipping")
+            except Exception as e:
+                logger.error(f"[PacketStream] Error processing first packet: {e}")
+
+            # Remaining packets arrive batch by batch from the worker
+            while True:
+                kind, payload = results_q.get()
+                if kind == "done":
+                    break
+                if kind == "error":
+                    logger.error(f"[PacketStream] Batched inference failed: {payload}")
+                    break
+                for waveform, sr in payload:
+                    if waveform is None or len(waveform) == 0:
+                        logger.warning("[PacketStream] Empty waveform in batch, skipping")
+                        continue
+                    yield self._postprocess(waveform, sr), self.sample_rate
+                    packets_yielded += 1
+
+            logger.info(
+                f"[PacketStream] ✅ Batched processing complete: "
+                f"{packets_yielded}/{len(text_packets)} packets yielded"
+            )
+        finally:
+            # Runs on normal completion and on GeneratorExit alike: stop
+            # the worker and drain whatever it already queued so an
+            # abandoned stream releases the thread and its buffers
+            cancelled.set()
+            while True:
+                try:
+                    results_q.get_nowait()
+                except queue.Empty:
+                    break
+
 
 def stream_audio_packets(
     text: str,
     language: str,
     inference_func,
     sample_rate: int = DEFAULT_SAMPLE_RATE,
-    words_per_packet: int = 5
-) -> Generator[bytes, None, None]:
+    words_per_packet: int = 5,
+    batched_inference_func=None
+) -> Generator[memoryview, None, None]:
     """
-    Stream audio packets as WAV bytes with constant latency.
-    
+    Stream raw PCM audio packets with constant latency.
+
     Args:
         text: Text to synthesize
         language: Language code
         inference_func: Function to generate audio from text
         sample_rate: Target sample rate
         words_per_packet: Words per packet (smaller = faster first packet)
-        
+        batched_inference_func: Optional batched inference function; when set,
+            packets after the first are processed in batches (see
+            PacketStreamingGenerator)
+
     Yields:
-        WAV-encoded audio chunks as bytes
+        Raw int16 PCM chunks as zero-copy memoryviews over the pooled
+        to_int16 buffer, which is overwritten on the next packet. A chunk
+        is only valid until this generator advances: send or process it
+        before pulling the next one, or copy with bytes(chunk) to retain
+        it. Collecting chunks into a list without copying ships
+        corrupted audio.
     """
     generator = PacketStreamingGenerator(
         inference_func=inference_func,
         sample_rate=sample_rate,
-        words_per_packet=words_per_packet
+        words_per_packet=words_per_packet,
+        batched_inference_func=batched_inference_func
     )
     
     first_packet_sent = False
     packet_count = 0
     total_chunks_yielded = 0
     
-    # Get total packet count for last packet detection
-    from backend.common.smart_chunking import SmartChunker
-    chunker = SmartChunker(max_words=words_per_packet)
-    text_packets = chunker.split_text(text)
+    # Chunk once via the generator's own chunker and reuse the result for
+    # both counting and generation - no second SmartChunker, no second pass
+    text_packets = generator.chunker.split_text(text)
     text_packets = [p for p in text_packets if p and p.strip()]
     total_packets = len(text_packets)
-    
+
     logger.info(f"[PacketStream] Will process {total_packets} packets total")
-    
+
     try:
-        for waveform, sr in generator.generate_packets(text, language):
+        for waveform, sr in generator.generate_packets(text, language, text_packets=text_packets):
             if waveform is None or len(waveform) == 0:
-                logger.warning(f"[PacketStream] Skipping empty waveform")
+                logger.warning("[PacketStream] Skipping empty waveform")
                 continue
-                
+
             packet_count += 1
             is_last_packet = (packet_count == total_packets)
-            
-            # Convert waveform to int16 for chunking
-            if waveform.dtype != np.int16:
-                waveform_int16 = (waveform * 32767).astype(np.int16)
-            else:
-                waveform_int16 = waveform
+
+            # Convert waveform to int16 for chunking (fused multiply+clip)
+            waveform_int16 = generator.to_int16(waveform)
             
             # For first packet: send smaller chunks for faster perceived latency
             if not first_packet_sent:
-                # Send first packet in small chunks (10ms)
-                chunks = list(wav_to_chunks(waveform_int16, sr, FIRST_CHUNK_SIZE_MS))
+                # Send first packet in small chunks, streaming each frame as
+                # soon as it's ready (no list materialization before send)
                 chunks_yielded_this_packet = 0
-                for chunk_bytes in chunks:
+                for chunk_bytes in wav_to_chunks(waveform_int16, sr, FIRST_CHUNK_SIZE_MS):
                     yield chunk_bytes
                     chunks_yielded_this_packet += 1
                     total_chunks_yielded += 1
                 first_packet_sent = True
-                logger.info(f"[PacketStream] First packet sent: {chunks_yielded_this_packet} chunks")
+                logger.info("[PacketStream] First packet sent: %d chunks", chunks_yielded_this_packet)
             else:
-                # Subsequent packets: send in larger chunks (30ms) for efficiency
-                chunks = list(wav_to_chunks(waveform_int16, sr, SUBSEQUENT_CHUNK_SIZE_MS))
+                # Subsequent packets: send in larger chunks for efficiency
                 chunks_yielded_this_packet = 0
-                is_last_packet = (packet_count == total_packets)
-                
-                for chunk_bytes in chunks:
+
+                for chunk_bytes in wav_to_chunks(waveform_int16, sr, SUBSEQUENT_CHUNK_SIZE_MS):
                     yield chunk_bytes
                     chunks_yielded_this_packet += 1
                     total_chunks_yielded += 1
-                
+
                 # CRITICAL: Log last packet chunks to verify all are sent
+                # (%-style args so formatting only runs if a handler accepts it)
                 if is_last_packet:
                     logger.info(
-                        f"[PacketStream] ✅ Last packet ({packet_count}/{total_packets}) sent: "
-                        f"{chunks_yielded_this_packet} chunks, {len(waveform_int16)} samples"
+                        "[PacketStream] ✅ Last packet (%d/%d) sent: %d chunks, %d samples",
+                        packet_count, total_packets, chunks_yielded_this_packet, len(waveform_int16)
                     )
-                else:
-                    logger.debug(f"[PacketStream] Packet {packet_count}/{total_packets} sent: {chunks_yielded_this_packet} chunks")
         
         # After loop completes, verify we processed all packets
         logger.info(
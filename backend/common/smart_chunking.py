@@ -3,12 +3,28 @@ Smart Chunking Algorithms for Streaming TTS
 Implements breath group heuristic and lookahead rolling window for <100ms latency.
 """
 
-import re
 import logging
+import re
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
 from typing import List, Tuple, Optional
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    logging.warning("[Chunker] pyahocorasick not available, using compiled-regex scans")
+
 logger = logging.getLogger(__name__)
 
+def _normalize_ws(s: str) -> str:
+    """Collapse whitespace runs to single spaces (C tokenizer, no regex)."""
+    return ' '.join(s.split())
+
 # Priority order for splitting (higher priority = split first)
 SPLIT_PRIORITY = {
     '.': 6,
@@ -30,6 +46,41 @@ SPLIT_PRIORITY = {
 # Word count threshold for soft breaks
 SOFT_BREAK_THRESHOLD = 5  # Split on soft boundaries if chunk exceeds this many words
 
+# Sorted once at import: _extract_next_chunk runs per chunk, so it should
+# not re-sort the priority dict on every call. Hard boundaries get their
+# own tuple because the short-text path only ever looks at those.
+HARD_BOUNDARIES = ('.', '?', '!')
+SOFT_BOUNDARIES = tuple(
+    boundary for boundary, priority in
+    sorted(SPLIT_PRIORITY.items(), key=lambda x: x[1], reverse=True)
+)
+
+# Dep-free fallback scanner when pyahocorasick is missing: one compiled
+# alternation pass instead of one str.find per boundary (same pattern as
+# the marker regexes in language_detection). The lookahead keeps matches
+# overlapping so every boundary's earliest position is seen.
+_BOUNDARY_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, sorted(SPLIT_PRIORITY, key=len, reverse=True))) + "))"
+)
+
+# Optional compiled core (smart_chunking_core.pyx, built manually with
+# cythonize). Imported after the boundary constants it reads back from
+# this module; pure Python remains the default path.
+try:
+    from backend.common.smart_chunking_core import split_text_fast as _split_text_fast
+    CYTHON_CORE_AVAILABLE = True
+except ImportError:
+    _split_text_fast = None
+    CYTHON_CORE_AVAILABLE = False
+
+
+def _skip_spaces(text: str, i: int) -> int:
+    """Advance i past any joining spaces (text is whitespace-normalized)."""
+    n = len(text)
+    while i < n and text[i] == ' ':
+        i += 1
+    return i
+
 
 class SmartChunker:
     """
@@ -49,165 +100,244 @@ class SmartChunker:
         """
         self.max_words = max_words
         self.min_words = min_words
+
+        # One automaton over all split boundaries: a single DFA pass replaces
+        # up to 14 independent text.find scans per chunk extraction
+        if AHOCORASICK_AVAILABLE:
+            self._boundary_automaton = ahocorasick.Automaton()
+            for boundary in SPLIT_PRIORITY:
+                self._boundary_automaton.add_word(boundary, (boundary, len(boundary)))
+            self._boundary_automaton.make_automaton()
+        else:
+            self._boundary_automaton = None
+
+    def _find_boundaries(self, text: str, start: int = 0) -> dict:
+        """
+        Locate the earliest occurrence of every split boundary in one pass.
+
+        With pyahocorasick this is a single DFA traversal; otherwise one
+        compiled alternation scan. Either way the 14 per-boundary str.find
+        calls collapse into one native pass.
+
+        Args:
+            text: Text to scan
+            start: Index to start scanning from
+
+        Returns:
+            Mapping of boundary -> first start index
+        """
+        earliest: dict = {}
+        if self._boundary_automaton is not None:
+            for end_idx, (boundary, blen) in self._boundary_automaton.iter(text, start):
+                if boundary not in earliest:
+                    earliest[boundary] = end_idx - blen + 1
+        else:
+            for m in _BOUNDARY_RE.finditer(text, start):
+                boundary = m.group(1)
+                if boundary not in earliest:
+                    earliest[boundary] = m.start()
+        return earliest
     
     def split_text(self, text: str) -> List[str]:
         """
         Split text into chunks using breath group heuristic.
-        
+
+        Results are memoized per (max_words, min_words, text): streaming
+        backends re-chunk identical prompts constantly (retries, warmups,
+        repeated IVR phrases), and a cache hit skips the whole scan.
+
         Args:
             text: Input text to chunk
-            
+
         Returns:
             List of text chunks
         """
-        if not text or not text.strip():
+        # isspace() avoids allocating a stripped copy just for the guard
+        if not text or text.isspace():
             return []
-        
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
-        
+        return list(_split_text_cached(self.max_words, self.min_words, text))
+
+    def split_batch(self, texts: List[str], num_threads: int = 1) -> List[List[str]]:
+        """
+        Split many prompts at once, sharing this chunker's compiled state.
+
+        All texts go through the same boundary automaton and result cache,
+        so batch calls amortize setup and benefit from repeated prompts.
+        With num_threads > 1 the texts are chunked on a thread pool - useful
+        when the optional Cython core (which can release the GIL) is built;
+        pure-Python chunking gains little from extra threads.
+
+        Args:
+            texts: Prompts to chunk
+            num_threads: Worker threads (1 = chunk inline)
+
+        Returns:
+            One chunk list per input text, in input order
+        """
+        if num_threads > 1 and len(texts) > 1:
+            with ThreadPoolExecutor(max_workers=num_threads) as pool:
+                return list(pool.map(self.split_text, texts))
+        return [self.split_text(text) for text in texts]
+
+    @staticmethod
+    def reset_cache():
+        """Clear the memoized split results (e.g. between benchmark runs)."""
+        _split_text_cached.cache_clear()
+
+    def _split_text_impl(self, text: str) -> List[str]:
+        """Uncached split implementation; called via _split_text_cached."""
+        # Normalize whitespace once; `text` stays normalized for the whole call
+        text = _normalize_ws(text)
+
+        # Fast path: most streaming prompts fit in one chunk. A short text
+        # with no hard boundary comes back unchanged, so skip the word-offset
+        # and cursor machinery entirely.
+        if text.count(' ') + 1 <= self.max_words and not any(b in text for b in HARD_BOUNDARIES):
+            return [text] if text else []
+
+        # Native fast path when the Cython core is built (same algorithm)
+        if CYTHON_CORE_AVAILABLE:
+            return _split_text_fast(text, self.max_words, self.min_words)
+
+        # Split into words once per call; word_starts[i] is the codepoint
+        # offset of words[i] in the normalized text. All chunk extraction
+        # works on these indices, so the remaining text is never re-split or
+        # re-allocated per iteration.
+        words = text.split(' ')
+        n_words = len(words)
+        word_starts = [0] * n_words
+        offset = 0
+        for i, word in enumerate(words):
+            word_starts[i] = offset
+            offset += len(word) + 1
+
         chunks = []
-        remaining = text
-        processed_length = 0
-        
-        while remaining and remaining.strip():
-            chunk = self._extract_next_chunk(remaining)
-            if chunk and chunk.strip():
-                chunks.append(chunk.strip())
-                # Find the chunk in remaining text (handle whitespace variations)
-                chunk_start = remaining.find(chunk.strip())
-                if chunk_start != -1:
-                    # Remove processed chunk from remaining text
-                    chunk_end = chunk_start + len(chunk.strip())
-                    remaining = remaining[chunk_end:].strip()
-                    processed_length += len(chunk.strip())
-                else:
-                    # Chunk not found exactly, try to remove by length
-                    remaining = remaining[len(chunk):].strip()
-                    processed_length += len(chunk)
-            else:
-                # No valid chunk found, take remaining as-is (CRITICAL: don't lose last part)
-                if remaining and remaining.strip():
-                    chunks.append(remaining.strip())
-                    processed_length += len(remaining.strip())
-                break
-        
-        # CRITICAL: Ensure last part is always included
-        # Check if we have remaining text that wasn't processed
-        if remaining and remaining.strip():
-            remaining_clean = remaining.strip()
-            # Check if this remaining text is already in chunks
-            all_chunks_text = ' '.join(chunks)
-            if remaining_clean not in all_chunks_text:
-                logger.warning(f"[Chunker] Adding remaining text as final chunk: '{remaining_clean[:50]}...'")
-                chunks.append(remaining_clean)
-        
-        # CRITICAL: Verify no text was lost by comparing character counts
-        reconstructed = ' '.join(chunks)
-        # Normalize both for comparison (remove extra spaces)
-        original_normalized = re.sub(r'\s+', ' ', text.strip())
-        reconstructed_normalized = re.sub(r'\s+', ' ', reconstructed.strip())
-        
-        # Compare character by character (ignoring whitespace differences)
-        original_chars = len(original_normalized.replace(' ', ''))
-        reconstructed_chars = len(reconstructed_normalized.replace(' ', ''))
-        
-        if reconstructed_chars < original_chars:
-            logger.error(
-                f"[Chunker] ⚠️ Text loss detected: original={original_chars} chars, "
-                f"reconstructed={reconstructed_chars} chars, loss={original_chars - reconstructed_chars} chars"
-            )
-            # Find missing text by comparing positions
-            missing_text = original_normalized[len(reconstructed_normalized):].strip()
-            if missing_text:
-                logger.warning(f"[Chunker] Adding missing text as final chunk: '{missing_text[:50]}...'")
-                chunks.append(missing_text)
-        
-        # Final verification: ensure we have all text
-        final_reconstructed = ' '.join(chunks)
-        final_normalized = re.sub(r'\s+', ' ', final_reconstructed.strip())
-        final_chars = len(final_normalized.replace(' ', ''))
-        
-        if final_chars < original_chars:
-            logger.error(
-                f"[Chunker] ❌ CRITICAL: Still missing text after recovery: "
-                f"original={original_chars}, final={final_chars}, loss={original_chars - final_chars}"
-            )
-            # Last resort: add everything that's missing
-            if len(final_normalized) < len(original_normalized):
-                remaining_all = original_normalized[len(final_normalized):].strip()
-                if remaining_all:
-                    logger.warning(f"[Chunker] Last resort: adding all remaining text: '{remaining_all[:50]}...'")
-                    chunks.append(remaining_all)
-        
-        logger.info(f"[Chunker] Split into {len(chunks)} chunks: {[len(c) for c in chunks]} chars each")
+        pos = 0
+        n = len(text)
+
+        # Text loss is impossible by construction: every character between
+        # the old and new cursor position lands in the emitted chunk (or is
+        # a joining space), and the fallback consumes to end-of-text. No
+        # post-hoc join/renormalize verification passes are needed.
+        while pos < n:
+            chunk, next_pos = self._extract_next_chunk(text, words, word_starts, pos)
+            if not chunk:
+                # No valid chunk found, take remaining as-is
+                chunk, next_pos = text[pos:], n
+
+            stripped = chunk.strip()
+            if stripped:
+                chunks.append(stripped)
+
+            # The extractor reports exactly how far it consumed - no substring
+            # search or re-strip needed to advance
+            pos = next_pos
+
+        # Gate the per-chunk length list-comp: it runs per utterance and is
+        # pure waste when INFO is off
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[Chunker] Split into %d chunks: %s chars each",
+                        len(chunks), [len(c) for c in chunks])
         return chunks
     
-    def _extract_next_chunk(self, text: str) -> Optional[str]:
+    def _extract_next_chunk(
+        self,
+        text: str,
+        words: List[str],
+        word_starts: List[int],
+        pos: int
+    ) -> Tuple[Optional[str], int]:
         """
-        Extract next chunk from text using priority-based splitting.
-        
+        Extract the next chunk starting at pos using priority-based splitting.
+
+        Operates on the word offsets computed once in split_text, so no
+        re-splitting or slicing of the remaining text is needed to count
+        words or locate boundaries.
+
         Args:
-            text: Remaining text to process
-            
+            text: Full normalized text
+            words: Words of the normalized text (split once by the caller)
+            word_starts: Codepoint offset of each word in text
+            pos: Cursor position where the next chunk starts
+
         Returns:
-            Next chunk (including split character) or None
+            Tuple of (chunk, next_pos): the next chunk (including split
+            character) or None, and the cursor position after the chunk and
+            any joining space
         """
-        if not text:
-            return None
-        
-        # Count words in potential chunk
-        words = text.split()
-        word_count = len(words)
-        
+        n = len(text)
+        if pos >= n:
+            return None, n
+
+        # Index of the word the cursor is in (or at the start of)
+        word_idx = bisect_right(word_starts, pos) - 1
+        word_count = len(words) - word_idx
+
+        # Candidate validity = word count of text[pos:end] >= min_words.
+        # Counting word starts inside the span answers that from the offset
+        # table alone, so rejected candidates never allocate a chunk slice.
+        min_span = self.min_words if self.min_words > 0 else 1
+
         # If text is short enough, return as-is
         if word_count <= self.max_words:
             # Check for hard boundaries first
-            for boundary in ['.', '?', '!']:
-                if boundary in text:
-                    idx = text.find(boundary)
-                    chunk = text[:idx + 1]
-                    if self._is_valid_chunk(chunk):
-                        return chunk
-            # No hard boundary, return entire text
-            return text
-        
-        # Text is too long, look for soft breaks
-        # Sort boundaries by priority (highest first)
-        boundaries = sorted(SPLIT_PRIORITY.items(), key=lambda x: x[1], reverse=True)
-        
-        for boundary, priority in boundaries:
-            # Search for boundary in text
-            idx = text.find(boundary)
+            for boundary in HARD_BOUNDARIES:
+                idx = text.find(boundary, pos)
+                if idx != -1:
+                    end = idx + 1
+                    if bisect_right(word_starts, end - 1) - word_idx >= min_span:
+                        return text[pos:end], _skip_spaces(text, end)
+            # No hard boundary, return entire remaining text
+            return text[pos:], n
+
+        # Text is too long, look for soft breaks (pre-sorted by priority)
+        # One multi-pattern scan instead of one find per boundary
+        earliest = self._find_boundaries(text, pos)
+
+        for boundary in SOFT_BOUNDARIES:
+            idx = earliest.get(boundary, -1)
             if idx != -1:
                 # Check if chunk before boundary is valid
-                chunk = text[:idx + len(boundary)]
-                if self._is_valid_chunk(chunk):
-                    return chunk
-        
-        # No suitable boundary found, take first max_words
-        # BUT: ensure we don't take more than available
-        chunk_words = words[:min(self.max_words, word_count)]
-        chunk = ' '.join(chunk_words)
-        
-        # Ensure we return something even if it's the whole text
-        if not chunk and text:
-            return text
-        
-        return chunk
+                end = idx + len(boundary)
+                if bisect_right(word_starts, end - 1) - word_idx >= min_span:
+                    return text[pos:end], _skip_spaces(text, end)
+
+        # No suitable boundary found, take the next max_words words
+        end_word = word_idx + self.max_words
+        if end_word < len(words):
+            return text[pos:word_starts[end_word] - 1], word_starts[end_word]
+        return text[pos:], n
     
     def _is_valid_chunk(self, chunk: str) -> bool:
         """
         Check if chunk is valid (meets minimum word requirement).
-        
+
+        split_text normalizes whitespace to single spaces, so counting
+        spaces gives the word count without allocating a list of substrings.
+
         Args:
             chunk: Text chunk to validate
-            
+
         Returns:
             True if chunk is valid
         """
-        words = chunk.split()
-        return len(words) >= self.min_words
+        stripped = chunk.strip()
+        return bool(stripped) and stripped.count(' ') + 1 >= self.min_words
+
+
+# Module-level so every SmartChunker with the same limits shares one cache
+# (instances aren't stable hash keys). Tuples keep cached results immutable;
+# split_text copies to a list on the way out.
+@lru_cache(maxsize=8)
+def _get_splitter(max_words: int, min_words: int) -> SmartChunker:
+    """One shared SmartChunker (and boundary automaton) per config."""
+    return SmartChunker(max_words=max_words, min_words=min_words)
+
+
+@lru_cache(maxsize=512)
+def _split_text_cached(max_words: int, min_words: int, text: str) -> Tuple[str, ...]:
+    """Memoized chunking keyed on the chunker config and input text."""
+    return tuple(_get_splitter(max_words, min_words)._split_text_impl(text))
 
 
 class LookaheadBuffer:
@@ -221,37 +351,42 @@ class LookaheadBuffer:
     def __init__(self, context_size: int = 3):
         """
         Initialize lookahead buffer.
-        
+
         Args:
             context_size: Number of words to use as context
         """
         self.context_size = context_size
-        self.previous_tokens: List[str] = []
-    
+        # Only the last context_size words are ever read, so a bounded deque
+        # keeps memory O(context_size) instead of O(chunk length)
+        self.previous_tokens: deque = deque(maxlen=context_size)
+
     def get_context_window(self, current_chunk: str) -> Tuple[str, str]:
         """
         Get context window for current chunk.
-        
+
         Args:
             current_chunk: Current chunk text
-            
+
         Returns:
             Tuple of (context_text, current_text)
             context_text includes previous tokens for prosody
             current_text is the actual chunk to synthesize
         """
-        current_words = current_chunk.split()
-        
+        # Split only as many words as the context needs: the leading words
+        # from the front, the trailing words via rsplit from the back. No
+        # full-chunk word list is ever materialized.
+        first_words = current_chunk.split(maxsplit=self.context_size)[:self.context_size]
+        tail_words = current_chunk.rsplit(maxsplit=self.context_size)[-self.context_size:]
+
         # Build context from previous tokens
-        context_words = self.previous_tokens[-self.context_size:] if self.previous_tokens else []
-        context_text = ' '.join(context_words + current_words[:self.context_size])
-        
-        # Update previous tokens
-        self.previous_tokens = current_words
-        
+        context_text = ' '.join(chain(self.previous_tokens, first_words))
+
+        # Update previous tokens (deque keeps only the last context_size)
+        self.previous_tokens.extend(tail_words)
+
         return context_text, current_chunk
-    
+
     def reset(self):
         """Reset buffer state."""
-        self.previous_tokens = []
+        self.previous_tokens.clear()
 
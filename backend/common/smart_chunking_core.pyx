@@ -0,0 +1,150 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Optional Cython core for SmartChunker.split_text.
+
+Build manually when you want the native fast path (it is not part of the
+normal install, which has no extension build step):
+
+    pip install cython
+    cythonize -i backend/common/smart_chunking_core.pyx
+
+smart_chunking.py picks this up automatically when the compiled module is
+importable and falls back to the pure-Python implementation otherwise.
+The algorithm mirrors SmartChunker._split_text_impl exactly: same cursor
+walk, same boundary priorities, same output.
+"""
+
+from libc.string cimport memchr
+
+from backend.common.smart_chunking import SOFT_BOUNDARIES
+
+# Hard boundaries as raw bytes, in priority order ('.', '?', '!')
+cdef unsigned char[3] _HARD_BYTES = [46, 63, 33]
+
+
+cdef inline Py_ssize_t _skip_spaces(unicode text, Py_ssize_t i, Py_ssize_t n):
+    while i < n and text[i] == u' ':
+        i += 1
+    return i
+
+
+cdef inline Py_ssize_t _cp_advance(const unsigned char* buf, Py_ssize_t byte_pos,
+                                   Py_ssize_t n_codepoints):
+    """Advance byte_pos past n_codepoints (UTF-8 lead-byte counting)."""
+    cdef Py_ssize_t seen = 0
+    while seen < n_codepoints:
+        byte_pos += 1
+        # Continuation bytes are 0b10xxxxxx; everything else starts a codepoint
+        while (buf[byte_pos] & 0xC0) == 0x80:
+            byte_pos += 1
+        seen += 1
+    return byte_pos
+
+
+cdef inline Py_ssize_t _cp_count(const unsigned char* buf, Py_ssize_t start_byte,
+                                 Py_ssize_t end_byte):
+    """Number of codepoints in buf[start_byte:end_byte]."""
+    cdef Py_ssize_t i, count = 0
+    for i in range(start_byte, end_byte):
+        if (buf[i] & 0xC0) != 0x80:
+            count += 1
+    return count
+
+
+cdef inline bint _is_valid(unicode chunk, int min_words):
+    cdef unicode stripped = chunk.strip()
+    if not stripped:
+        return False
+    return stripped.count(u' ') + 1 >= min_words
+
+
+def split_text_fast(unicode text, int max_words, int min_words):
+    """
+    Chunk whitespace-normalized text with the breath group heuristic.
+
+    Args:
+        text: Normalized input (single spaces, no leading/trailing ws)
+        max_words: Maximum words per chunk
+        min_words: Minimum words per chunk
+
+    Returns:
+        List of text chunks
+    """
+    cdef Py_ssize_t n = len(text)
+    cdef Py_ssize_t pos = 0, idx, end, end_word, word_idx, offset
+    cdef Py_ssize_t n_words, i
+    cdef int j
+    cdef unicode chunk, stripped, boundary
+    cdef list chunks = []
+    cdef list word_starts = []
+
+    if n == 0:
+        return chunks
+
+    # Encode once: ASCII hard boundaries are scanned over the UTF-8 bytes
+    # with memchr (UTF-8 is prefix-free, so a '.' byte is always a '.').
+    # byte_pos tracks the cursor's byte offset alongside the codepoint pos.
+    cdef bytes utf8 = text.encode('utf-8')
+    cdef const unsigned char* buf = utf8
+    cdef Py_ssize_t nbytes = len(utf8)
+    cdef Py_ssize_t byte_pos = 0
+    cdef const unsigned char* p
+
+    # Word offsets computed once, as in the Python implementation
+    words = text.split(u' ')
+    n_words = len(words)
+    offset = 0
+    for i in range(n_words):
+        word_starts.append(offset)
+        offset += len(<unicode>words[i]) + 1
+
+    while pos < n:
+        chunk = None
+        end = n
+
+        # Word index of the cursor (linear probe is fine: word_starts is
+        # consumed monotonically and chunks are short)
+        word_idx = 0
+        for i in range(n_words):
+            if <Py_ssize_t>word_starts[i] > pos:
+                break
+            word_idx = i
+
+        if n_words - word_idx <= max_words:
+            # memchr per hard boundary: a few cycles per cache line vs a
+            # unicode find through the interpreter
+            for j in range(3):
+                p = <const unsigned char*>memchr(buf + byte_pos, _HARD_BYTES[j],
+                                                 nbytes - byte_pos)
+                if p != NULL:
+                    idx = pos + _cp_count(buf, byte_pos, p - buf)
+                    if _is_valid(text[pos:idx + 1], min_words):
+                        chunk = text[pos:idx + 1]
+                        end = _skip_spaces(text, idx + 1, n)
+                        break
+            if chunk is None:
+                chunk = text[pos:]
+                end = n
+        else:
+            for boundary in SOFT_BOUNDARIES:
+                idx = text.find(boundary, pos)
+                if idx != -1 and _is_valid(text[pos:idx + len(boundary)], min_words):
+                    chunk = text[pos:idx + len(boundary)]
+                    end = _skip_spaces(text, idx + len(boundary), n)
+                    break
+            if chunk is None:
+                end_word = word_idx + max_words
+                if end_word < n_words:
+                    chunk = text[pos:<Py_ssize_t>word_starts[end_word] - 1]
+                    end = <Py_ssize_t>word_starts[end_word]
+                else:
+                    chunk = text[pos:]
+                    end = n
+
+        stripped = chunk.strip()
+        if stripped:
+            chunks.append(stripped)
+        byte_pos = _cp_advance(buf, byte_pos, end - pos)
+        pos = end
+
+    return chunks
@@ -0,0 +1,282 @@
+"""
+Audio Streaming Utilities
+Normalization, silence trimming, chunking and telephony format conversion
+for TTS waveforms.
+"""
+
+import logging
+import math
+from typing import Generator, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Telephony sample rates
+PCM_16K_RATE = 16000
+PCM_8K_RATE = 8000
+
+# Normalization headroom: peak lands at 95% full scale to avoid clipping
+# after downstream filtering
+NORMALIZE_PEAK = 0.95
+
+# Default silence threshold (fraction of full scale)
+SILENCE_THRESHOLD = 0.01
+
+# Padding kept around the trimmed region so speech doesn't start abruptly
+TRIM_PAD_MS = 10
+
+
+def normalize_audio(waveform: np.ndarray, peak: float = NORMALIZE_PEAK) -> np.ndarray:
+    """
+    Normalize a float waveform so its peak sits at `peak` full scale.
+
+    Args:
+        waveform: Audio samples (float)
+        peak: Target peak amplitude
+
+    Returns:
+        Normalized waveform (unchanged if silent)
+    """
+    abs_max = float(np.max(np.abs(waveform))) if waveform.size else 0.0
+    if abs_max <= 0.0:
+        return waveform
+    return waveform * (peak / abs_max)
+
+
+def trim_silence(
+    waveform: np.ndarray,
+    sample_rate: int,
+    threshold: float = SILENCE_THRESHOLD,
+    pad_ms: int = TRIM_PAD_MS
+) -> np.ndarray:
+    """
+    Trim leading and trailing silence from a waveform.
+
+    Args:
+        waveform: Audio samples (float)
+        sample_rate: Sample rate in Hz
+        threshold: Amplitude below which samples count as silence
+        pad_ms: Padding kept on each side of the speech region
+
+    Returns:
+        Trimmed waveform (unchanged if entirely silent)
+    """
+    loud = np.flatnonzero(np.abs(waveform) > threshold)
+    if loud.size == 0:
+        return waveform
+    pad = int(sample_rate * pad_ms / 1000)
+    start = max(int(loud[0]) - pad, 0)
+    end = min(int(loud[-1]) + pad + 1, len(waveform))
+    return waveform[start:end]
+
+
+def fused_normalize_trim(
+    waveform: np.ndarray,
+    sample_rate: int,
+    threshold: float = SILENCE_THRESHOLD,
+    pad_ms: int = TRIM_PAD_MS,
+    peak: float = NORMALIZE_PEAK
+) -> np.ndarray:
+    """
+    Normalize and trim in one fused pass over the array.
+
+    normalize_audio + trim_silence read and write the full waveform twice
+    each; this computes the peak and the speech bounds from a single
+    np.abs scan, then does one fused scale of just the trimmed region -
+    array traffic drops from ~4x to ~2x.
+
+    Args:
+        waveform: Audio samples (float)
+        sample_rate: Sample rate in Hz
+        threshold: Amplitude below which samples count as silence
+        pad_ms: Padding kept on each side of the speech region
+        peak: Target peak amplitude
+
+    Returns:
+        Normalized, trimmed waveform
+    """
+    if waveform.size == 0:
+        return waveform
+
+    abs_w = np.abs(waveform)
+    abs_max = float(abs_w.max())
+    if abs_max <= 0.0:
+        return waveform
+
+    # The chained ops trim *after* scaling to peak, so fold the gain into
+    # the threshold instead: |s| * (peak / abs_max) > threshold. Comparing
+    # the raw samples against the bare threshold would change the trim
+    # bounds for any waveform whose peak isn't already near the target.
+    loud = np.flatnonzero(abs_w > threshold * abs_max / peak)
+    if loud.size:
+        pad = int(sample_rate * pad_ms / 1000)
+        start = max(int(loud[0]) - pad, 0)
+        end = min(int(loud[-1]) + pad + 1, len(waveform))
+        waveform = waveform[start:end]
+
+    return waveform * (peak / abs_max)
+
+
+def fuse_norm_trim_i16(
+    waveform: np.ndarray,
+    sample_rate: int,
+    silence_thresh: float = SILENCE_THRESHOLD
+) -> Tuple[np.ndarray, int]:
+    """
+    Fused normalize + trim + int16 quantization.
+
+    One np.abs scan yields the peak and speech bounds; the trimmed region
+    is then scaled, clipped and cast to int16 in a single fused step
+    instead of the three separate full-array passes.
+
+    Args:
+        waveform: Audio samples (float)
+        sample_rate: Sample rate in Hz
+        silence_thresh: Amplitude below which samples count as silence
+
+    Returns:
+        Tuple of (int16 waveform, sample_rate)
+    """
+    if waveform.dtype == np.int16:
+        return waveform, sample_rate
+    if waveform.size == 0:
+        return waveform.astype(np.int16), sample_rate
+
+    abs_w = np.abs(waveform)
+    abs_max = float(abs_w.max())
+    if abs_max <= 0.0:
+        return np.zeros(len(waveform), dtype=np.int16), sample_rate
+
+    # Same gain-folded threshold as fused_normalize_trim: the chain trims
+    # the normalized signal, so compare against thresh * abs_max / peak
+    loud = np.flatnonzero(abs_w > silence_thresh * abs_max / NORMALIZE_PEAK)
+    if loud.size:
+        pad = int(sample_rate * TRIM_PAD_MS / 1000)
+        start = max(int(loud[0]) - pad, 0)
+        end = min(int(loud[-1]) + pad + 1, len(waveform))
+        waveform = waveform[start:end]
+
+    scaled = waveform * (32767.0 * NORMALIZE_PEAK / abs_max)
+    np.clip(scaled, -32768.0, 32767.0, out=scaled)
+    return scaled.astype(np.int16), sample_rate
+
+
+def wav_to_chunks(
+    waveform: np.ndarray,
+    sample_rate: int,
+    chunk_ms: int
+) -> Generator[memoryview, None, None]:
+    """
+    Slice an int16 waveform into fixed-duration PCM chunks.
+
+    Args:
+        waveform: int16 audio samples
+        sample_rate: Sample rate in Hz
+        chunk_ms: Chunk duration in milliseconds
+
+    Yields:
+        Zero-copy byte views (raw little-endian int16 PCM) per chunk.
+        Chunks may alias a pooled buffer the producer reuses (the
+        packet-streaming path overwrites it on the next packet), so a
+        chunk is only guaranteed valid until the producing generator
+        advances - consume it immediately or copy with bytes(chunk)
+        to retain it.
+    """
+    if waveform.dtype != np.int16:
+        waveform, _ = fuse_norm_trim_i16(waveform, sample_rate)
+
+    # One byte view over the whole buffer, sliced per chunk: tobytes()
+    # allocated and copied ~1.7 KB per 40 ms packet, N times per stream
+    data = memoryview(np.ascontiguousarray(waveform)).cast("B")
+    chunk_bytes = max(int(sample_rate * chunk_ms / 1000), 1) * 2
+    for start in range(0, len(data), chunk_bytes):
+        yield data[start:start + chunk_bytes]
+
+
+def _resample(waveform: np.ndarray, sample_rate: int, target_rate: int) -> np.ndarray:
+    """Linear-interpolation resample (float in, float out)."""
+    if sample_rate == target_rate:
+        return waveform
+    n_out = int(math.ceil(len(waveform) * target_rate / sample_rate))
+    x_out = np.linspace(0.0, len(waveform) - 1, n_out)
+    return np.interp(x_out, np.arange(len(waveform)), waveform)
+
+
+def to_pcm_16k(waveform: np.ndarray, sample_rate: int) -> bytes:
+    """
+    Convert a waveform to 16 kHz 16-bit PCM bytes (telecom wideband).
+
+    Args:
+        waveform: Audio samples (float or int16)
+        sample_rate: Source sample rate in Hz
+
+    Returns:
+        Little-endian int16 PCM bytes at 16 kHz
+    """
+    if waveform.dtype == np.int16:
+        waveform = waveform.astype(np.float32) / 32768.0
+    resampled = _resample(waveform, sample_rate, PCM_16K_RATE)
+    int16_wave, _ = fuse_norm_trim_i16(resampled, PCM_16K_RATE)
+    return int16_wave.tobytes()
+
+
+def to_pcm_8k(waveform: np.ndarray, sample_rate: int) -> bytes:
+    """
+    Convert a waveform to 8 kHz 16-bit PCM bytes (telecom narrowband).
+
+    Args:
+        waveform: Audio samples (float or int16)
+        sample_rate: Source sample rate in Hz
+
+    Returns:
+        Little-endian int16 PCM bytes at 8 kHz
+    """
+    if waveform.dtype == np.int16:
+        waveform = waveform.astype(np.float32) / 32768.0
+    resampled = _resample(waveform, sample_rate, PCM_8K_RATE)
+    int16_wave, _ = fuse_norm_trim_i16(resampled, PCM_8K_RATE)
+    return int16_wave.tobytes()
+
+
+def to_g711_ulaw(waveform: np.ndarray, sample_rate: int) -> bytes:
+    """
+    Convert a waveform to 8 kHz G.711 mu-law bytes.
+
+    Args:
+        waveform: Audio samples (float or int16)
+        sample_rate: Source sample rate in Hz
+
+    Returns:
+        mu-law encoded bytes at 8 kHz
+    """
+    if waveform.dtype == np.int16:
+        waveform = waveform.astype(np.float32) / 32768.0
+    resampled = _resample(waveform, sample_rate, PCM_8K_RATE)
+    int16_wave, _ = fuse_norm_trim_i16(resampled, PCM_8K_RATE)
+    return _linear_to_ulaw(int16_wave).tobytes()
+
+
+def _linear_to_ulaw(samples: np.ndarray) -> np.ndarray:
+    """
+    Vectorized 16-bit linear PCM -> G.711 mu-law encoding.
+
+    Args:
+        samples: int16 audio samples
+
+    Returns:
+        uint8 mu-law codes
+    """
+    BIAS = 0x84
+    CLIP = 32635
+
+    s = samples.astype(np.int32)
+    sign = np.where(s < 0, 0x80, 0x00)
+    magnitude = np.minimum(np.abs(s), CLIP) + BIAS
+
+    # Exponent = MSB position above bit 7 (0..7)
+    exponent = (np.floor(np.log2(magnitude)).astype(np.int32) - 7)
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+
+    ulaw = ~(sign | (exponent << 4) | mantissa) & 0xFF
+    return ulaw.astype(np.uint8)
@@ -0,0 +1,114 @@
+"""
+gTTS Response Cache
+Memory + disk caching for the gTTS fallback path.
+
+Telecom/IVR workloads repeat the same prompts constantly; caching the
+decoded waveform turns a ~500ms Google TTS round-trip into a dict lookup
+(memory hit) or a single .npz read (disk hit, survives restarts).
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# In-memory entries kept (LRU). A 5s utterance at 24 kHz is ~470 KB, so
+# 512 entries bound memory at roughly 250 MB worst case
+MEM_CACHE_SIZE = 512
+
+CACHE_DIR = Path(os.environ.get("TTS_GTTS_CACHE_DIR", Path.home() / ".cache" / "tts_gtts"))
+CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+# Memory tier: OrderedDict as LRU (lru_cache can't be populated from the
+# disk tier after a fetch, so the eviction is managed explicitly)
+_mem_cache: "OrderedDict[str, Tuple[np.ndarray, int]]" = OrderedDict()
+_mem_lock = threading.Lock()
+
+
+def _cache_key(text: str, language: str) -> str:
+    """Stable key for a (text, language) pair."""
+    return hashlib.sha1(f"{language}:{text}".encode("utf-8")).hexdigest()
+
+
+def get(text: str, language: str) -> Optional[Tuple[np.ndarray, int]]:
+    """
+    Look up a cached waveform: memory tier first, then disk.
+
+    Args:
+        text: Input text
+        language: Language code
+
+    Returns:
+        Tuple of (waveform, sample_rate) or None on miss
+    """
+    key = _cache_key(text, language)
+
+    with _mem_lock:
+        entry = _mem_cache.get(key)
+        if entry is not None:
+            _mem_cache.move_to_end(key)
+            return entry
+
+    disk_path = CACHE_DIR / f"{key}.npz"
+    if disk_path.exists():
+        try:
+            with np.load(disk_path) as data:
+                entry = (data["waveform"], int(data["sample_rate"]))
+            _mem_put(key, entry)
+            logger.debug(f"[TTSCache] Disk hit: {key}")
+            return entry
+        except Exception as e:
+            logger.warning(f"[TTSCache] Corrupt cache entry {disk_path}, removing: {e}")
+            disk_path.unlink(missing_ok=True)
+
+    return None
+
+
+def put(text: str, language: str, waveform: np.ndarray, sample_rate: int) -> None:
+    """
+    Store a waveform in both cache tiers.
+
+    Args:
+        text: Input text
+        language: Language code
+        waveform: Decoded audio samples
+        sample_rate: Sample rate in Hz
+    """
+    key = _cache_key(text, language)
+    _mem_put(key, (waveform, sample_rate))
+
+    # Write to a temp path and os.replace so a crash never leaves a
+    # partial entry behind (same pattern as the ONNX export cache)
+    disk_path = CACHE_DIR / f"{key}.npz"
+    tmp_path = disk_path.with_suffix(".npz.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            np.savez(f, waveform=waveform, sample_rate=sample_rate)
+        os.replace(tmp_path, disk_path)
+    except Exception as e:
+        logger.warning(f"[TTSCache] Disk write failed for {key}: {e}")
+        tmp_path.unlink(missing_ok=True)
+
+
+def _mem_put(key: str, entry: Tuple[np.ndarray, int]) -> None:
+    """Insert into the memory tier, evicting the least recently used."""
+    with _mem_lock:
+        _mem_cache[key] = entry
+        _mem_cache.move_to_end(key)
+        while len(_mem_cache) > MEM_CACHE_SIZE:
+            _mem_cache.popitem(last=False)
+
+
+def clear() -> None:
+    """Drop both cache tiers (memory and disk)."""
+    with _mem_lock:
+        _mem_cache.clear()
+    for path in CACHE_DIR.glob("*.npz"):
+        path.unlink(missing_ok=True)
@@ -3,10 +3,11 @@ Unified TTS Engine
 GPU-optimized TTS inference engine supporting MMS-TTS and IndicTTS.
 """
 
+import functools
 import logging
 import time
 from pathlib import Path
-from typing import Generator, Literal, Optional, Tuple
+from typing import Callable, Generator, Literal, Optional, Tuple
 
 import numpy as np
 import soundfile as sf
@@ -28,10 +29,14 @@ from backend.common.config import (
     FIRST_CHUNK_SIZE_MS,
     SUBSEQUENT_CHUNK_SIZE_MS,
     LOW_LATENCY_MODE,
+    MPS_MAX_TOKENS,
     USE_FP16_ON_CUDA,
+    USE_TORCH_COMPILE,
 )
+from backend.common import tts_cache
 from backend.common.device_utils import get_optimal_device
 from backend.common.streaming import (
+    fused_normalize_trim,
     normalize_audio,
     to_g711_ulaw,
     to_pcm_16k,
@@ -50,12 +55,16 @@ UseCase = Literal["web_ui", "telecom", "fallback"]
 class TTSEngine:
     """
     Unified TTS Engine for GPU-accelerated inference.
-    
+
     Supports:
     - MMS-TTS (high quality, Web UI)
     - IndicTTS (fallback, gTTS)
     """
 
+    # Token-length buckets for CUDA graph capture: short telecom packets
+    # land in the small buckets, Web UI sentences in the large ones
+    _GRAPH_BUCKETS = (8, 16, 32, 64, 128)
+
     def __init__(self):
         """Initialize TTS Engine with device detection."""
         self.device_type, self.device = get_optimal_device()
@@ -63,6 +72,27 @@ class TTSEngine:
         # Model instances
         self.mms_tts_models: dict[str, Tuple[VitsModel, AutoTokenizer]] = {}
         self.indictts_loaded = False
+
+        # Pre-bound tokenizer closures, one per loaded language: tokenize,
+        # cast ids to long and land on the inference device in a single call
+        self._tok_cache: dict[str, Callable[[str], dict]] = {}
+
+        # ONNX Runtime sessions per language (CUDA fast path)
+        self.mms_tts_onnx: dict[str, object] = {}
+
+        # Device-resident input buffers for IO binding, keyed by ids shape:
+        # reusing an OrtValue of the same length skips its reallocation
+        self._ort_ids_cache: dict[tuple, object] = {}
+
+        # Captured CUDA graphs keyed by (language, bucket_len):
+        # (graph, static_ids, static_out). Replay removes the tens of
+        # cudaLaunchKernel calls that dominate short-utterance latency.
+        self._cuda_graphs: dict[tuple, tuple] = {}
+
+        # Reused pinned-memory staging buffers for D2H waveform copies,
+        # keyed by (sample_bucket, dtype). Pinned targets let CUDA DMA
+        # directly instead of staging through a driver bounce buffer.
+        self._pinned_buffers: dict[tuple, torch.Tensor] = {}
         
         # ONNX optimizer for GPU acceleration
         try:
@@ -102,21 +132,60 @@ class TTSEngine:
             # Load tokenizer
             tokenizer = AutoTokenizer.from_pretrained(model_name)
             
-            # Load model
-            model = VitsModel.from_pretrained(model_name)
+            # FP16 on CUDA if the device has a fast half path (1.5-2x on H100)
+            dtype = torch.float32
+            if self.device_type == "cuda" and USE_FP16_ON_CUDA and torch.cuda.is_available():
+                if self._fp16_supported():
+                    dtype = torch.float16
+                    logger.info("[TTS] Loading in FP16 mixed precision for CUDA (low-latency mode)")
+
+            # Load directly in the target dtype: low_cpu_mem_usage memory-maps
+            # the checkpoint instead of materializing an FP32 copy first, so
+            # peak load RSS is halved and the full-model half() cast disappears
+            try:
+                model = VitsModel.from_pretrained(
+                    model_name, torch_dtype=dtype, low_cpu_mem_usage=True
+                )
+            except Exception as e:
+                logger.warning(f"[TTS] Direct {dtype} load failed: {e}. Loading FP32.")
+                model = VitsModel.from_pretrained(model_name)
+                if dtype == torch.float16:
+                    model = model.half()
             model.to(self.device)
             model.eval()
             
-            # Use FP16 for CUDA if enabled (1.5-2x speedup on H100)
-            if self.device_type == "cuda" and USE_FP16_ON_CUDA and torch.cuda.is_available():
+            # Compile the decoder on CUDA: Inductor fuses the VITS graph and
+            # reduce-overhead mode wraps replays in its own CUDA graphs
+            if self.device_type == "cuda" and USE_TORCH_COMPILE:
                 try:
-                    model = model.half()
-                    logger.info("[TTS] Enabled FP16 mixed precision for CUDA (low-latency mode)")
+                    model = torch.compile(model, mode="reduce-overhead", dynamic=True)
+                    logger.info("[TTS] torch.compile enabled (reduce-overhead)")
                 except Exception as e:
-                    logger.warning(f"[TTS] Could not convert to FP16: {e}. Using FP32.")
-            
+                    logger.warning(f"[TTS] torch.compile unavailable: {e}. Using eager.")
+
+            # INT8 linears for CPU inference (no calibration needed)
+            if self.device_type == "cpu":
+                model = self._quantize_cpu(model)
+
             load_time = (time.time() - start_time) * 1000
             self.mms_tts_models[language] = (model, tokenizer)
+            self._tok_cache[language] = self._make_tokenize(tokenizer)
+
+            # On CUDA, also export to ONNX Runtime: with the DEFAULT conv
+            # algo search the session skips cuDNN's per-call algorithm sweep,
+            # a large steady-state win for the conv-heavy VITS stack
+            if self.onnx_optimizer is not None and self.device_type == "cuda":
+                try:
+                    # Export the eager module, not the compile() wrapper
+                    session = self.onnx_optimizer.optimize_vits(
+                        getattr(model, "_orig_mod", model),
+                        f"mms_tts_{language}", device=self.device_type
+                    )
+                    if session is not None:
+                        self.mms_tts_onnx[language] = session
+                        logger.info(f"[TTS] MMS-TTS {language} using ONNX Runtime backend")
+                except Exception as e:
+                    logger.warning(f"[TTS] ONNX export failed for {language}, using PyTorch: {e}")
             
             logger.info(
                 f"[TTS] Model={MODEL_MMS_TTS} Device={self.device_type} "
@@ -127,6 +196,73 @@ class TTSEngine:
             logger.error(f"[TTS] Failed to load MMS-TTS model for {language}: {e}")
             raise
     
+    @staticmethod
+    def _quantize_cpu(model: VitsModel) -> VitsModel:
+        """
+        Apply dynamic INT8 quantization for CPU inference.
+
+        Quantizes the linear layers in place-of (no calibration pass
+        needed); on AVX-512/VNNI hosts the matmuls run on INT8 dot-product
+        instructions with a fraction of the activation bandwidth. Falls
+        back to the FP32 model if quantization is unavailable.
+        """
+        try:
+            quantized = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            logger.info("[TTS] Applied dynamic INT8 quantization for CPU inference")
+            return quantized
+        except Exception as e:
+            logger.warning(f"[TTS] INT8 quantization failed, using FP32: {e}")
+            return model
+
+    def _fp16_supported(self) -> bool:
+        """
+        Check whether this CUDA device has a fast FP16 path.
+
+        Pascal/Turing consumer cards (GTX 16xx and friends) run FP16 at
+        half FP32 speed or worse, so half() there is a regression, not an
+        optimization. Ampere+ (SM >= 8.0) and the datacenter Volta parts
+        are the ones that actually benefit.
+        """
+        try:
+            major, minor = torch.cuda.get_device_capability(self.device)
+            if major >= 8:
+                return True
+            if major == 7 and torch.cuda.get_device_name(self.device).startswith(
+                ("Tesla V100", "A100")
+            ):
+                return True
+            logger.info(
+                f"[TTS] Disabling FP16: device SM{major}.{minor} has slow/unsupported FP16 path"
+            )
+            return False
+        except Exception as e:
+            logger.warning(f"[TTS] Could not query compute capability: {e}. Keeping FP32.")
+            return False
+
+    def _make_tokenize(self, tokenizer: AutoTokenizer) -> Callable[[str], dict]:
+        """
+        Bind a fast tokenize closure for one language.
+
+        The closure tokenizes, casts input_ids to long, and moves every
+        tensor to the inference device in one step - the tokenize/cast/move
+        work that used to be scattered across _infer_mms_tts.
+        """
+        target = self.device
+
+        def _tokenize(text: str) -> dict:
+            encoded = tokenizer(text, return_tensors="pt")
+            inputs = {}
+            for k, v in encoded.items():
+                if k == "input_ids":
+                    inputs[k] = v.to(target, dtype=torch.long, non_blocking=True)
+                else:
+                    inputs[k] = v.to(target, non_blocking=True)
+            return inputs
+
+        return _tokenize
+
     def load_indictts(self, language: Language) -> None:
         """
         Load IndicTTS (gTTS fallback) for specified language.
@@ -155,6 +291,27 @@ class TTSEngine:
             logger.error(f"[TTS] Failed to load IndicTTS: {e}")
             raise
     
+    def ensure_loaded(self, language: Language, model_type: ModelType) -> None:
+        """
+        Idempotently load the model backing a request if it isn't resident.
+
+        Under lazy loading (LAZY_LOAD_MODELS) only the most-used language is
+        pre-loaded at startup; request handlers call this so the other
+        language faults in on first use. The already-loaded check in
+        load_mms_tts/load_indictts makes the warm-path cost one dict lookup.
+
+        Args:
+            language: Language code ('gu' or 'mr')
+            model_type: Engine model type ('mms_tts' or 'indictts')
+        """
+        if model_type == "mms_tts":
+            if language not in self.mms_tts_models:
+                logger.info(f"[TTS] Lazy-loading MMS-TTS model for {language}")
+                self.load_mms_tts(language)
+        elif model_type == "indictts":
+            if not self.indictts_loaded:
+                self.load_indictts(language)
+
     def select_model(self, use_case: UseCase) -> ModelType:
         """
         Select model based on use case.
@@ -199,11 +356,8 @@ class TTSEngine:
             else:
                 raise ValueError(f"Unknown model type: {model_type}")
             
-            # Normalize audio
-            waveform = normalize_audio(waveform)
-            
-            # Trim silence
-            waveform = trim_silence(waveform, sample_rate)
+            # Normalize + trim in one fused pass (one stats scan, one write)
+            waveform = fused_normalize_trim(waveform, sample_rate)
             
             inference_time = (time.time() - start_time) * 1000
             
@@ -227,7 +381,7 @@ class TTSEngine:
         model_type: Optional[ModelType] = None,
         low_latency: bool = LOW_LATENCY_MODE,
         streaming: bool = True
-    ) -> Generator[bytes, None, None]:
+    ) -> Generator[Tuple[memoryview, int] | memoryview, None, None]:
         """
         Generate audio in chunks for streaming with constant latency.
         
@@ -243,9 +397,15 @@ class TTSEngine:
             model_type: Override model type (if None, uses use_case)
             low_latency: Enable low-latency optimizations (smaller first chunk)
             streaming: Use packet-based streaming (True) or generate full audio first (False)
-            
+
         Yields:
-            Binary audio chunks (WAV format) sent immediately as packets are generated
+            With streaming=True: (chunk, n_samples) tuples - raw int16 PCM
+            audio plus its authoritative sample count, so callers can keep a
+            running duration total without re-deriving it from byte lengths.
+            Streamed chunks are views over a pooled buffer that is reused
+            for the next packet: consume each chunk before advancing, or
+            copy with bytes(chunk) to retain it.
+            With streaming=False: bare audio chunks (legacy path).
         """
         if model_type is None:
             model_type = self.select_model(use_case)
@@ -255,22 +415,49 @@ class TTSEngine:
             from backend.common.packet_streaming import stream_audio_packets
             
             # Create inference function for the selected model
+            batched_inference_func = None
             if model_type == MODEL_MMS_TTS:
-                inference_func = lambda t, l: self._infer_mms_tts(t, l)
+                # Resolve the language and model once for the whole request,
+                # then bind them into the packet inference function: each
+                # packet dispatches straight into the forward instead of
+                # repeating detection, model lookup and tokenizer wrapping
+                from backend.common.language_detection import detect_language, script_of
+                detected_lang = script_of(text) or detect_language(text)
+                if detected_lang and detected_lang != language:
+                    logger.warning(
+                        f"[TTS] ⚠️ Language auto-correction: user selected '{language}', "
+                        f"but text is detected as '{detected_lang}'. Using '{detected_lang}'."
+                    )
+                    language = detected_lang
+                if language not in self.mms_tts_models:
+                    self.load_mms_tts(language)
+                model, _ = self.mms_tts_models[language]
+                inference_func = functools.partial(
+                    self._infer_mms_tts_fast,
+                    model=model,
+                    tokenize=self._tok_cache[language],
+                )
+                # Batch packets after the first into one padded forward:
+                # amortizes launch overhead and raises GPU occupancy
+                if self.device_type == "cuda":
+                    batched_inference_func = self._infer_mms_tts_batch
             elif model_type == MODEL_INDICTTS:
-                inference_func = lambda t, l: self._infer_indictts(t, l)
+                inference_func = self._infer_indictts
             else:
                 raise ValueError(f"Unsupported model type for streaming: {model_type}")
-            
-            # Stream packets with constant latency
+
+            # Stream packets with constant latency. Chunks are byte views
+            # over int16 PCM, so the engine owns the sample arithmetic and
+            # yields the count alongside the audio
             for chunk_bytes in stream_audio_packets(
                 text=text,
                 language=language,
                 inference_func=inference_func,
                 sample_rate=DEFAULT_SAMPLE_RATE,
-                words_per_packet=5  # Small packets for fast first response
+                words_per_packet=5,  # Small packets for fast first response
+                batched_inference_func=batched_inference_func
             ):
-                yield chunk_bytes
+                yield chunk_bytes, len(chunk_bytes) // 2
         else:
             # Fallback: Generate full audio and chunk it (for compatibility)
             waveform, sample_rate = self.infer_wav(text, language, use_case, model_type)
@@ -282,16 +469,18 @@ class TTSEngine:
                 waveform_int16 = waveform
             
             if low_latency:
-                first_chunk_size_ms = FIRST_CHUNK_SIZE_MS
-                subsequent_chunk_size_ms = SUBSEQUENT_CHUNK_SIZE_MS
-                
-                chunks = list(wav_to_chunks(waveform_int16, sample_rate, first_chunk_size_ms))
-                if chunks:
-                    yield chunks[0]
-                    remaining_waveform = waveform_int16[int(first_chunk_size_ms * sample_rate / 1000):]
-                    if len(remaining_waveform) > 0:
-                        for chunk in wav_to_chunks(remaining_waveform, sample_rate, subsequent_chunk_size_ms):
-                            yield chunk
+                # Chunks are zero-copy byte views over the one int16 buffer
+                # (each memoryview pins it); per-chunk tobytes() allocated
+                # and copied every packet
+                data = memoryview(np.ascontiguousarray(waveform_int16)).cast("B")
+                first_bytes = int(FIRST_CHUNK_SIZE_MS * sample_rate / 1000) * 2
+                if len(data):
+                    yield data[:first_bytes]
+
+                step_bytes = int(SUBSEQUENT_CHUNK_SIZE_MS * sample_rate / 1000) * 2
+                if step_bytes > 0:
+                    for start in range(first_bytes, len(data), step_bytes):
+                        yield data[start:start + step_bytes]
             else:
                 for chunk in wav_to_chunks(waveform_int16, sample_rate, chunk_ms):
                     yield chunk
@@ -302,12 +491,16 @@ class TTSEngine:
         if not text or not text.strip():
             raise ValueError("Input text is empty or contains only whitespace")
         
-        # Auto-detect language FIRST - always prioritize detection over user selection
-        from backend.common.language_detection import detect_language
+        # Auto-detect language FIRST - always prioritize detection over user
+        # selection. The script probe stops at the first Indic codepoint;
+        # full scoring only runs for script-ambiguous text.
+        from backend.common.language_detection import detect_language, script_of
         original_language = language  # Keep track of original selection
-        detected_lang = detect_language(text)
-        
-        # ALWAYS use detected language if available and different from selection
+        detected_lang = script_of(text) or detect_language(text)
+
+        # ALWAYS use detected language if available and different from selection.
+        # Detection decides the model up front, so there is no tokenize-then-
+        # retry-with-the-other-model ladder anymore.
         if detected_lang:
             if detected_lang != language:
                 logger.warning(
@@ -319,130 +512,135 @@ class TTSEngine:
                 logger.debug(f"[TTS] ✓ Language confirmed: {language}")
         else:
             logger.info(f"[TTS] Language detection uncertain, using user selection: {language}")
-        
+
         if language not in self.mms_tts_models:
             self.load_mms_tts(language)
-        
-        model, tokenizer = self.mms_tts_models[language]
-        
-        # Tokenize - ensure inputs are properly formatted
+
+        model, _ = self.mms_tts_models[language]
+
+        # One call through the cached closure: tokenize + long cast + device
+        # placement, instead of a fresh BatchEncoding and tensor moves per
+        # retry branch
         try:
-            inputs = tokenizer(text, return_tensors="pt")
+            inputs = self._tok_cache[language](text)
         except Exception as e:
-            logger.error(f"[TTS] Tokenization failed: {e}")
-            # Try with detected language if different from current
-            if detected_lang and detected_lang != language:
-                logger.info(f"[TTS] Retrying with detected language: {detected_lang}")
-                if detected_lang not in self.mms_tts_models:
-                    self.load_mms_tts(detected_lang)
-                model, tokenizer = self.mms_tts_models[detected_lang]
-                try:
-                    inputs = tokenizer(text, return_tensors="pt")
-                except Exception as e2:
-                    raise ValueError(
-                        f"Failed to tokenize text with both selected ({original_language}) "
-                        f"and detected ({detected_lang}) languages. Error: {e2}"
-                    )
-            else:
-                raise ValueError(
-                    f"Failed to tokenize text. The text might not be in the correct language ({original_language}).\n"
-                    f"Error: {e}\n"
-                    f"Tip: Make sure the selected language matches the text language."
-                )
-        
-        # Validate tokenization result
-        if "input_ids" not in inputs:
-            raise ValueError("Tokenizer did not return input_ids. The text might not be compatible with this model.")
-        
+            raise ValueError(
+                f"Failed to tokenize text. The text might not be in the correct language ({original_language}).\n"
+                f"Error: {e}\n"
+                f"Tip: Make sure the selected language matches the text language."
+            )
+
         input_ids = inputs["input_ids"]
-        
-        # Check if input_ids is empty or has invalid shape
         if input_ids.numel() == 0 or input_ids.shape[1] == 0:
-            # Try with detected language if available
-            if detected_lang and detected_lang != language:
-                logger.info(f"[TTS] Empty tokenization, retrying with detected language: {detected_lang}")
-                if detected_lang not in self.mms_tts_models:
-                    self.load_mms_tts(detected_lang)
-                model, tokenizer = self.mms_tts_models[detected_lang]
-                inputs = tokenizer(text, return_tensors="pt")
-                input_ids = inputs["input_ids"]
-                
-                if input_ids.numel() == 0 or input_ids.shape[1] == 0:
-                    raise ValueError(
-                        f"Tokenization produced empty input even with detected language ({detected_lang}).\n"
-                        f"This usually means:\n"
-                        f"1. The text contains only unsupported characters\n"
-                        f"2. The tokenizer cannot process this text\n"
-                        f"Text provided: {text[:100]}..."
-                    )
-                # Update language for rest of function
-                language = detected_lang
-                logger.info(f"[TTS] Successfully tokenized with detected language: {detected_lang}")
-            else:
-                # Try one more time with direct detection
-                if detected_lang and detected_lang != language:
-                    logger.info(f"[TTS] Final retry with detected language: {detected_lang}")
-                    if detected_lang not in self.mms_tts_models:
-                        self.load_mms_tts(detected_lang)
-                    model, tokenizer = self.mms_tts_models[detected_lang]
-                    inputs = tokenizer(text, return_tensors="pt")
-                    input_ids = inputs["input_ids"]
-                    if input_ids.numel() > 0 and input_ids.shape[1] > 0:
-                        language = detected_lang
-                        logger.info(f"[TTS] Successfully tokenized with detected language: {detected_lang}")
-                    else:
-                        raise ValueError(
-                            f"Tokenization failed with both selected ({original_language}) and detected ({detected_lang}) languages.\n"
-                            f"This usually means:\n"
-                            f"1. The text contains only unsupported characters\n"
-                            f"2. The tokenizer cannot process this text\n"
-                            f"Text provided: {text[:100]}..."
-                        )
-                else:
-                    raise ValueError(
-                        f"Tokenization produced empty input with language {language}.\n"
-                        f"Original selection: {original_language}, Detected: {detected_lang}\n"
-                        f"This usually means:\n"
-                        f"1. The text language doesn't match the model language\n"
-                        f"2. The text contains only unsupported characters\n"
-                        f"3. The tokenizer cannot process this text\n"
-                        f"Text provided: {text[:100]}...\n"
-                        f"Tip: The system detected this might be {detected_lang if detected_lang else 'unknown'} language."
-                    )
-        
-        # Ensure input_ids are Long/Int tensors (not float)
-        inputs["input_ids"] = input_ids.long()
-        
-        # MPS has a limitation: output channels > 65536 not supported
-        # For long texts, use CPU to avoid this limitation
-        # Also, MPS doesn't provide significant speedup for MMS-TTS
-        use_device = "cpu" if self.device_type == "mps" else self.device
-        
-        if use_device == "cpu":
-            # Keep inputs on CPU, ensure proper types
-            # input_ids must be Long, other tensors can be float
-            processed_inputs = {}
-            for k, v in inputs.items():
-                if k == "input_ids":
-                    processed_inputs[k] = v.cpu().long()
-                else:
-                    processed_inputs[k] = v.cpu()
-            inputs = processed_inputs
-            model_cpu = model.cpu()
-        else:
-            # Move to device, ensure input_ids are Long
-            processed_inputs = {}
-            for k, v in inputs.items():
-                if k == "input_ids":
-                    processed_inputs[k] = v.to(self.device).long()
-                else:
-                    processed_inputs[k] = v.to(self.device)
-            inputs = processed_inputs
-            model_cpu = model
-        
-        # Generate with FP16 if enabled
-        with torch.no_grad():
-            if self.device_type == "cuda" and USE_FP16_ON_CUDA and model_cpu.dtype == torch.float16:
+            raise ValueError(
+                f"Tokenization produced empty input with language {language}.\n"
+                f"Original selection: {original_language}, Detected: {detected_lang}\n"
+                f"This usually means:\n"
+                f"1. The text language doesn't match the model language\n"
+                f"2. The text contains only unsupported characters\n"
+                f"3. The tokenizer cannot process this text\n"
+                f"Text provided: {text[:100]}..."
+            )
+
+        return self._mms_forward(text, language, model, inputs)
+
+    def _infer_mms_tts_fast(
+        self,
+        text: str,
+        language: Language,
+        model: VitsModel = None,
+        tokenize: Callable[[str], dict] = None
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Hot-path MMS-TTS inference for packet streaming.
+
+        The model and tokenize closure are bound once per request (see
+        infer_chunked), so each packet skips the language detection,
+        model lookup and tokenizer error wrapping that _infer_mms_tts
+        repeats per call.
+
+        Args:
+            text: Packet text to synthesize
+            language: Resolved language code ('gu' or 'mr')
+            model: Pre-resolved VitsModel for the language
+            tokenize: Pre-bound tokenize closure for the language
+
+        Returns:
+            Tuple of (waveform, sample_rate)
+        """
+        inputs = tokenize(text)
+        input_ids = inputs["input_ids"]
+        if input_ids.numel() == 0 or input_ids.shape[1] == 0:
+            raise ValueError(f"Tokenization produced empty input for packet: {text[:50]}")
+        return self._mms_forward(text, language, model, inputs)
+
+    def _mms_forward(
+        self,
+        text: str,
+        language: Language,
+        model: VitsModel,
+        inputs: dict
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Run the MMS-TTS forward for already-tokenized input.
+
+        Dispatches to the fastest available backend in order: ONNX
+        Runtime session, captured CUDA graph, eager forward.
+
+        Args:
+            text: Source text (used for MPS splitting and diagnostics)
+            language: Resolved language code ('gu' or 'mr')
+            model: VitsModel for the language
+            inputs: Tokenized inputs on the inference device
+
+        Returns:
+            Tuple of (waveform, sample_rate)
+        """
+        input_ids = inputs["input_ids"]
+
+        # ONNX Runtime fast path (CUDA): the session owns device placement,
+        # so feed it the raw int64 ids and take the waveform straight back
+        session = self.mms_tts_onnx.get(language)
+        if session is not None:
+            ids_np = input_ids.detach().cpu().numpy()
+            waveform = self._run_onnx(session, ids_np)
+            waveform = np.asarray(waveform, dtype=np.float32).squeeze()
+            return waveform, 16000  # MMS-TTS default
+
+        # CUDA graph replay: copy the padded ids into the captured static
+        # input and replay - no per-call kernel launches. Use the smallest
+        # bucket that fits and slice the output by the token ratio.
+        if self.device_type == "cuda" and self._cuda_graphs:
+            token_count = input_ids.shape[1]
+            for bucket in self._GRAPH_BUCKETS:
+                entry = self._cuda_graphs.get((language, bucket))
+                if entry is not None and token_count <= bucket:
+                    graph, static_ids, static_out = entry
+                    static_ids.zero_()
+                    static_ids[0, :token_count] = input_ids[0]
+                    graph.replay()
+                    est_len = int(static_out.shape[-1] * token_count / bucket)
+                    # Pinned D2H in the capture dtype (FP16 on CUDA), upcast host-side
+                    waveform = self._to_host(static_out[..., :est_len])
+                    return waveform, 16000  # MMS-TTS default
+
+        # MPS caps conv output channels at 65536, which only very long
+        # inputs exceed. Split those at sentence level and synthesize the
+        # pieces on MPS rather than migrating the model to CPU per request
+        # (an O(|params|) copy each way).
+        if self.device_type == "mps" and input_ids.shape[1] > MPS_MAX_TOKENS:
+            split_result = self._infer_mms_tts_split(text, language)
+            if split_result is not None:
+                return split_result
+            logger.warning(
+                f"[TTS] Text exceeds MPS token budget ({input_ids.shape[1]} > {MPS_MAX_TOKENS}) "
+                f"but has no split point, running as-is"
+            )
+
+        # Generate with FP16 if enabled (inference_mode also drops the
+        # autograd view/version tracking that no_grad still pays for)
+        with torch.inference_mode():
+            if self.device_type == "cuda" and USE_FP16_ON_CUDA and model.dtype == torch.float16:
                 # Ensure inputs are FP16 compatible (input_ids stay int, others can be FP16)
                 fp16_inputs = {}
                 for k, v in inputs.items():
@@ -452,66 +650,241 @@ class TTSEngine:
                         fp16_inputs[k] = v.half()  # Convert to FP16
                     else:
                         fp16_inputs[k] = v
-                output = model_cpu(**fp16_inputs).waveform
+                output = model(**fp16_inputs).waveform
             else:
-                output = model_cpu(**inputs).waveform
-        
-        # Move to CPU and convert to numpy
-        # Convert FP16 to FP32 for numpy compatibility
-        if output.dtype == torch.float16:
-            waveform = output.cpu().float().squeeze().numpy()
-        else:
-            waveform = output.cpu().squeeze().numpy()
+                output = model(**inputs).waveform
+
+        # Move to CPU through the pinned staging path (direct DMA on CUDA,
+        # FP16 on the wire, float32 upcast host-side)
+        waveform = self._to_host(output)
         sample_rate = 16000  # MMS-TTS default
-        
-        # Move model back to original device if needed
-        if use_device == "cpu" and self.device_type != "cpu":
-            model.to(self.device)
-        
+
         return waveform, sample_rate
-    
+
+    def _infer_mms_tts_split(self, text: str, language: Language) -> Optional[Tuple[np.ndarray, int]]:
+        """
+        Synthesize an over-budget MPS input as sentence-level pieces.
+
+        Each piece re-enters _infer_mms_tts (and so re-checks the token
+        budget); the waveforms are concatenated in order. MMS-TTS
+        tokenizes roughly per character, so the chunker's word budget
+        keeps pieces comfortably under MPS_MAX_TOKENS.
+
+        Args:
+            text: Text to convert to speech
+            language: Language code ('gu' or 'mr')
+
+        Returns:
+            Tuple of (waveform, sample_rate), or None if the text has no
+            split point
+        """
+        from backend.common.smart_chunking import SmartChunker
+
+        chunks = SmartChunker(max_words=30, min_words=2).split_text(text)
+        if len(chunks) <= 1:
+            return None
+
+        waveforms = []
+        sample_rate = 16000  # MMS-TTS default
+        for chunk in chunks:
+            waveform, sample_rate = self._infer_mms_tts(chunk, language)
+            waveforms.append(waveform)
+        return np.concatenate(waveforms), sample_rate
+
+    # Largest waveform staged through pinned memory: 8M samples is ~8
+    # minutes of 16 kHz audio; anything longer takes the pageable path
+    _PINNED_MAX_SAMPLES = 1 << 23
+
+    def _to_host(self, output: torch.Tensor) -> np.ndarray:
+        """
+        Copy a waveform tensor to host memory as float32.
+
+        On CUDA the copy lands in a reused pinned staging buffer sized to
+        the next power-of-two sample count, so the D2H transfer is a
+        direct DMA instead of staging through a pageable bounce buffer.
+        The transfer stays in the model dtype (FP16 halves PCIe bytes);
+        the float32 upcast copies out of the staging buffer host-side,
+        which also keeps the buffer free for the next request.
+
+        Args:
+            output: Waveform tensor (any shape; squeezed to 1D)
+
+        Returns:
+            float32 numpy waveform
+        """
+        output = output.squeeze()
+        n = output.numel()
+
+        if output.is_cuda and 0 < n <= self._PINNED_MAX_SAMPLES:
+            bucket = 1 << (n - 1).bit_length()
+            key = (bucket, output.dtype)
+            buf = self._pinned_buffers.get(key)
+            if buf is None:
+                try:
+                    buf = torch.empty(bucket, dtype=output.dtype, pin_memory=True)
+                    self._pinned_buffers[key] = buf
+                except RuntimeError as e:
+                    logger.warning(f"[TTS] Pinned buffer allocation failed: {e}")
+            if buf is not None:
+                buf[:n].copy_(output.reshape(-1), non_blocking=True)
+                torch.cuda.synchronize()
+                return buf[:n].numpy().astype(np.float32)
+
+        waveform = output.cpu().numpy()
+        if waveform.dtype != np.float32:
+            waveform = waveform.astype(np.float32)
+        return waveform
+
+    def _infer_mms_tts_batch(self, texts: list, language: Language) -> list:
+        """
+        Batched MMS-TTS inference for packet streaming.
+
+        Tokenizes all packets together with padding and runs one forward,
+        so the GPU sees a single batched launch instead of one forward per
+        packet. Per-sample waveforms are sliced by the token-length ratio
+        (VITS output length scales with input tokens).
+
+        Args:
+            texts: Text packets to synthesize
+            language: Language code ('gu' or 'mr')
+
+        Returns:
+            List of (waveform, sample_rate) tuples, one per input text
+        """
+        if language not in self.mms_tts_models:
+            self.load_mms_tts(language)
+
+        model, tokenizer = self.mms_tts_models[language]
+
+        inputs = tokenizer(texts, padding=True, return_tensors="pt")
+        inputs = {
+            k: v.to(self.device, dtype=torch.long, non_blocking=True) if k == "input_ids"
+            else v.to(self.device, non_blocking=True)
+            for k, v in inputs.items()
+        }
+
+        with torch.inference_mode():
+            output = model(**inputs).waveform  # (batch, samples), padded
+
+        # Transfer in the model dtype (FP16 halves D2H bytes), upcast on CPU
+        batch_np = output.cpu().numpy()
+        if batch_np.dtype != np.float32:
+            batch_np = batch_np.astype(np.float32)
+
+        # Slice each padded row by its token share of the padded length
+        token_counts = inputs["attention_mask"].sum(dim=1).cpu() \
+            if "attention_mask" in inputs else None
+        max_tokens = inputs["input_ids"].shape[1]
+        results = []
+        for i, text in enumerate(texts):
+            row = batch_np[i]
+            if token_counts is not None and max_tokens > 0:
+                est_len = int(len(row) * int(token_counts[i]) / max_tokens)
+                row = row[:est_len] if est_len > 0 else row
+            results.append((row, 16000))  # MMS-TTS default
+        return results
+
+    def _run_onnx(self, session, ids_np: np.ndarray) -> np.ndarray:
+        """
+        Run an ONNX session, with IO binding on CUDA.
+
+        session.run() bundles H2D/D2H copies into every call; for short
+        utterances those copies dominate. Binding a device-resident input
+        buffer (reused per ids shape) and a device output keeps transfers
+        to the single final waveform read-back.
+        """
+        try:
+            import onnxruntime as ort
+
+            if "CUDAExecutionProvider" in session.get_providers():
+                ids_ort = self._ort_ids_cache.get(ids_np.shape)
+                if ids_ort is None:
+                    ids_ort = ort.OrtValue.ortvalue_from_numpy(ids_np, 'cuda', 0)
+                    self._ort_ids_cache[ids_np.shape] = ids_ort
+                else:
+                    ids_ort.update_inplace(ids_np)
+
+                io_binding = session.io_binding()
+                io_binding.bind_ortvalue_input("input_ids", ids_ort)
+                io_binding.bind_output("waveform", "cuda")
+                session.run_with_iobinding(io_binding)
+                return io_binding.get_outputs()[0].numpy()
+        except Exception as e:
+            logger.warning(f"[TTS] IO binding failed, falling back to session.run: {e}")
+
+        return session.run(None, {"input_ids": ids_np})[0]
+
     def _infer_indictts(self, text: str, language: Language) -> Tuple[np.ndarray, int]:
-        """Internal: IndicTTS (gTTS) inference."""
+        """Internal: IndicTTS (gTTS) inference with response caching."""
         if not self.indictts_loaded:
             self.load_indictts(language)
-        
+
+        # Memory/disk cache first: IVR prompts repeat constantly and a hit
+        # skips the ~500ms Google TTS round-trip entirely
+        cached = tts_cache.get(text, language)
+        if cached is not None:
+            return cached
+
         try:
+            import io
+
             from gtts import gTTS
             from pydub import AudioSegment
-            import tempfile
-            import os
-            
+
             # Generate with gTTS
             tts = gTTS(text=text, lang=language, slow=False)
-            
-            # Save to temporary MP3
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp:
-                tmp_path = tmp.name
-            
-            tts.save(tmp_path)
-            
-            # Convert to WAV
-            audio = AudioSegment.from_mp3(tmp_path)
-            
-            # Convert to numpy
-            samples = audio.get_array_of_samples()
-            waveform = np.array(samples, dtype=np.float32)
-            
+
+            # Decode the MP3 entirely in memory: no temp file creation,
+            # disk write, re-read, or unlink on the request path
+            buf = io.BytesIO()
+            tts.write_to_fp(buf)
+            buf.seek(0)
+            audio = AudioSegment.from_file(buf, format="mp3")
+
+            # View the decoded PCM bytes directly instead of copying through
+            # get_array_of_samples, then one vectorized float conversion
+            if audio.sample_width == 2:
+                waveform = np.frombuffer(audio.raw_data, dtype=np.int16).astype(np.float32)
+            else:
+                waveform = np.array(audio.get_array_of_samples(), dtype=np.float32)
+
             # Normalize
             if audio.channels == 2:
                 waveform = waveform.reshape((-1, 2)).mean(axis=1)
-            
+
             waveform = waveform / 32768.0
             sample_rate = audio.frame_rate
-            
-            # Clean up
-            os.unlink(tmp_path)
-            
+
+            tts_cache.put(text, language, waveform, sample_rate)
             return waveform, sample_rate
-            
+
         except ImportError:
             raise RuntimeError("gTTS not installed. Install with: pip install gtts pydub")
-    
+
+    async def _infer_indictts_async(self, text: str, language: Language) -> Tuple[np.ndarray, int]:
+        """
+        Async IndicTTS (gTTS) inference.
+
+        Cache hits return without leaving the event loop; misses run the
+        blocking gTTS fetch + MP3 decode in the default executor so the
+        loop stays free to serve other requests during the network wait.
+
+        Args:
+            text: Text to convert to speech
+            language: Language code ('gu' or 'mr')
+
+        Returns:
+            Tuple of (waveform, sample_rate)
+        """
+        cached = tts_cache.get(text, language)
+        if cached is not None:
+            return cached
+
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._infer_indictts, text, language)
+
+
     def warmup_gpu(self) -> None:
         """Warm up GPU with dummy inference."""
         if self.device_type == "cuda" and torch.cuda.is_available():
@@ -524,11 +897,54 @@ class TTSEngine:
                 # Run dummy inference
                 dummy_text = "નમસ્તે"
                 self._infer_mms_tts(dummy_text, "gu")
-                
+
+                # Capture CUDA graphs for the PyTorch path (the ONNX
+                # session manages its own launches)
+                # reduce-overhead compile manages its own CUDA graphs, so
+                # only capture manually on the eager path; either way run a
+                # second warm length so both Inductor graphs get cached
+                if "gu" not in self.mms_tts_onnx and not USE_TORCH_COMPILE:
+                    self._capture_cuda_graphs("gu")
+                elif USE_TORCH_COMPILE:
+                    self._infer_mms_tts("નમસ્તે, કેમ છો તમે આજે", "gu")
+
                 # Clear cache
                 torch.cuda.empty_cache()
-                
+
                 logger.info("[TTS] GPU warmup complete")
             except Exception as e:
                 logger.warning(f"[TTS] GPU warmup failed: {e}")
 
+    def _capture_cuda_graphs(self, language: Language) -> None:
+        """
+        Capture one CUDA graph per token-length bucket for a language.
+
+        Each replay then issues the whole forward as a single launch
+        instead of tens of ~10us cudaLaunchKernel calls, which dominate
+        latency for short utterances.
+        """
+        model, _ = self.mms_tts_models[language]
+        stream = torch.cuda.Stream()
+        for bucket in self._GRAPH_BUCKETS:
+            try:
+                static_ids = torch.ones(
+                    (1, bucket), dtype=torch.long, device=self.device
+                )
+                # Warm eager passes on a side stream before capture
+                stream.wait_stream(torch.cuda.current_stream())
+                with torch.cuda.stream(stream), torch.no_grad():
+                    for _ in range(3):
+                        model(input_ids=static_ids).waveform
+                torch.cuda.current_stream().wait_stream(stream)
+
+                graph = torch.cuda.CUDAGraph()
+                with torch.cuda.graph(graph), torch.no_grad():
+                    static_out = model(input_ids=static_ids).waveform
+                self._cuda_graphs[(language, bucket)] = (graph, static_ids, static_out)
+                logger.info(f"[TTS] Captured CUDA graph: lang={language} tokens={bucket}")
+            except Exception as e:
+                logger.warning(
+                    f"[TTS] CUDA graph capture failed at bucket {bucket}: {e}"
+                )
+                break
+
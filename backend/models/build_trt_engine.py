@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Build TensorRT engines for the MMS-TTS models.
+
+Exports each VitsModel to ONNX (reusing the engine's cached export when
+present) and compiles it with trtexec using an FP16 dynamic-shape profile
+covering realistic token lengths. The resulting .plan files enable Tensor
+Core kernels and layer fusion beyond what cuDNN provides; serve them
+through TensorRT (e.g. ONNX Runtime's TensorrtExecutionProvider with its
+engine cache pointed at the output directory) on deployments that have
+TensorRT installed.
+
+Usage:
+    python backend/models/build_trt_engine.py [gu] [mr]
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.common.config import MMS_TTS_GU_MODEL, MMS_TTS_MR_MODEL
+
+ENGINES_DIR = Path(__file__).parent / "trt_engines"
+ENGINES_DIR.mkdir(exist_ok=True)
+
+MMS_MODELS = {
+    "gu": MMS_TTS_GU_MODEL,
+    "mr": MMS_TTS_MR_MODEL,
+}
+
+# Dynamic shape profile for input_ids: short telecom prompts up to long
+# Web UI paragraphs. opt is tuned to the typical packet length.
+MIN_SHAPE = "input_ids:1x4"
+OPT_SHAPE = "input_ids:1x48"
+MAX_SHAPE = "input_ids:1x256"
+
+
+def export_onnx(language: str) -> Path:
+    """Export the MMS-TTS model for a language to ONNX, or reuse the cache."""
+    from transformers import VitsModel
+
+    from backend.common.onnx_optimizer import ONNXOptimizer
+
+    optimizer = ONNXOptimizer()
+    model_name = MMS_MODELS[language]
+
+    print(f"Loading {model_name}...")
+    model = VitsModel.from_pretrained(model_name).eval()
+
+    fingerprint = optimizer._model_fingerprint(model)
+    onnx_path = optimizer.cache_dir / f"mms_tts_{language}.{fingerprint}.vits.onnx"
+
+    if onnx_path.exists():
+        print(f"✅ Reusing cached ONNX export: {onnx_path}")
+        return onnx_path
+
+    session = optimizer.optimize_vits(model, f"mms_tts_{language}", device="cpu")
+    if session is None and not onnx_path.exists():
+        raise RuntimeError(f"ONNX export failed for {language}")
+    print(f"✅ ONNX export ready: {onnx_path}")
+    return onnx_path
+
+
+def build_engine(language: str) -> bool:
+    """Build a TensorRT engine for one language via trtexec."""
+    try:
+        onnx_path = export_onnx(language)
+    except Exception as e:
+        print(f"❌ Could not export ONNX for {language}: {e}")
+        return False
+
+    plan_path = ENGINES_DIR / f"vits_{language}.plan"
+    if plan_path.exists():
+        print(f"✅ Engine already built: {plan_path}")
+        return True
+
+    cmd = [
+        "trtexec",
+        f"--onnx={onnx_path}",
+        "--fp16",
+        f"--minShapes={MIN_SHAPE}",
+        f"--optShapes={OPT_SHAPE}",
+        f"--maxShapes={MAX_SHAPE}",
+        f"--saveEngine={plan_path}",
+    ]
+    print(f"Building TensorRT engine for {language}: {' '.join(cmd)}")
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    except FileNotFoundError:
+        print("❌ trtexec not found. Install TensorRT and ensure trtexec is on PATH.")
+        return False
+
+    if result.returncode != 0:
+        print(f"❌ trtexec failed for {language}:\n{result.stderr[-2000:]}")
+        return False
+
+    print(f"✅ TensorRT engine saved: {plan_path}")
+    return True
+
+
+def main():
+    languages = sys.argv[1:] or list(MMS_MODELS)
+    ok = True
+    for language in languages:
+        if language not in MMS_MODELS:
+            print(f"❌ Unknown language: {language}")
+            ok = False
+            continue
+        ok = build_engine(language) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,10 @@ This generates a simple reference audio that can be used for voice cloning.
 
 import sys
 from pathlib import Path
+
+import numpy as np
+import soundfile as sf
 import torch
-import torchaudio
 
 # Monkey-patch torch.load
 _original_torch_load = torch.load
@@ -31,12 +33,16 @@ def create_default_speaker(output_path: Path):
     ref_text = "Hello, this is a reference audio for text to speech synthesis."
     print(f"Generating reference audio: {ref_text}")
     
-    tts.tts_to_file(
-        text=ref_text,
-        file_path=str(output_path),
-        language="en"
+    # Synthesize in memory and write once: tts_to_file goes through Coqui's
+    # file pipeline (extra resampling/normalization passes and a temp file)
+    wav = tts.tts(text=ref_text, language="en")
+    sf.write(
+        str(output_path),
+        np.asarray(wav, dtype=np.float32),
+        22050,
+        subtype='PCM_16'
     )
-    
+
     print(f"✅ Default speaker reference created: {output_path}")
 
 if __name__ == "__main__":
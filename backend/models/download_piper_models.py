@@ -8,8 +8,20 @@ import sys
 import json
 import tarfile
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# Parallel download workers: model + config files across both languages
+DOWNLOAD_WORKERS = 4
+# Streamed read size (1 MiB keeps syscall count low without big buffers)
+STREAM_CHUNK_BYTES = 1 << 20
+
 MODELS_DIR = Path(__file__).parent / "piper_models"
 MODELS_DIR.mkdir(exist_ok=True)
 
@@ -28,11 +40,23 @@ PIPER_MODELS = {
 }
 
 
-def download_file(url: str, output_path: Path):
-    """Download a file from URL."""
+def _stream_to_file(client, url: str, output_path: Path):
+    """Stream a response body to disk in large chunks (no full buffering)."""
+    with client.stream("GET", url, follow_redirects=True) as response:
+        response.raise_for_status()
+        with open(output_path, "wb") as f:
+            for chunk in response.iter_raw(STREAM_CHUNK_BYTES):
+                f.write(chunk)
+
+
+def download_file(url: str, output_path: Path, client=None):
+    """Download a file from URL (streamed via httpx when available)."""
     print(f"Downloading {url}...")
     try:
-        urllib.request.urlretrieve(url, output_path)
+        if client is not None:
+            _stream_to_file(client, url, output_path)
+        else:
+            urllib.request.urlretrieve(url, output_path)
         print(f"✅ Downloaded: {output_path}")
         return True
     except Exception as e:
@@ -40,7 +64,7 @@ def download_file(url: str, output_path: Path):
         return False
 
 
-def download_piper_model(language: str):
+def download_piper_model(language: str, client=None):
     """Download Piper model for a language."""
     if language not in PIPER_MODELS:
         print(f"❌ Unknown language: {language}")
@@ -55,14 +79,14 @@ def download_piper_model(language: str):
     
     # Download model file
     if not model_file.exists():
-        if not download_file(model_info["url"], model_file):
+        if not download_file(model_info["url"], model_file, client):
             return False
     else:
         print(f"✅ Model file already exists: {model_file}")
     
     # Download config file
     if not config_file.exists():
-        if not download_file(model_info["config_url"], config_file):
+        if not download_file(model_info["config_url"], config_file, client):
             # Try to create a basic config if download fails
             print("⚠️  Config download failed, creating basic config...")
             basic_config = {
@@ -103,11 +127,25 @@ def main():
     print("🚀 Downloading Piper TTS models...")
     print(f"   Output directory: {MODELS_DIR}\n")
     
-    success = True
-    for lang in languages:
-        print(f"\n📦 Downloading {lang.upper()} model...")
-        if not download_piper_model(lang):
-            success = False
+    # Parallel streamed downloads: one worker per (language, file), shared
+    # HTTP client so connections (and HTTP/2 multiplexing when the h2
+    # extra is installed) are reused across files
+    client = None
+    if HTTPX_AVAILABLE:
+        try:
+            client = httpx.Client(http2=True, timeout=60.0)
+        except ImportError:
+            client = httpx.Client(timeout=60.0)
+
+    try:
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            results = list(executor.map(
+                lambda lang: download_piper_model(lang, client), languages
+            ))
+        success = all(results)
+    finally:
+        if client is not None:
+            client.close()
     
     if success:
         print("\n✅ All models downloaded successfully!")
@@ -4,51 +4,83 @@ Provides dependency injection for TTS engine and validation functions.
 """
 
 import logging
+import os
+from functools import lru_cache
 from typing import Literal
 
 from backend.common.tts_engine import TTSEngine, USE_CASE_WEB_UI
 
 logger = logging.getLogger(__name__)
 
-# Global TTS engine instance
-_tts_engine: TTSEngine | None = None
+# When true, only the most-used language (gu) is pre-loaded at startup;
+# the other faults in on first request via engine.ensure_loaded. Trades
+# one slow first request per language for roughly half the model VRAM
+# and boot time on single-language deployments.
+LAZY_LOAD_MODELS = os.getenv("LAZY_LOAD_MODELS", "false").lower() in ("true", "1", "yes")
 
+# API model name -> engine model type. Call sites index this directly;
+# a function call per request just adds a frame around one dict lookup.
+MODEL_MAP: dict[str, Literal["mms_tts", "indictts"]] = {
+    "mms": "mms_tts",
+    "indic": "indictts",
+}
 
+
+@lru_cache(maxsize=1)
 def get_tts_engine() -> TTSEngine:
     """
     Get or create the global TTS engine instance.
-    
+
+    The lru_cache makes the singleton check a C-level lookup inside the
+    wrapper instead of a Python global-and-branch per Depends() call.
+
     Returns:
         TTSEngine instance
     """
-    global _tts_engine
-    
-    if _tts_engine is None:
-        logger.info("[TTS] Initializing global TTS engine...")
-        _tts_engine = TTSEngine()
-        
-        # Pre-load models for both languages
-        try:
+    logger.info("[TTS] Initializing global TTS engine...")
+    engine = TTSEngine()
+
+    # Pre-load models (both languages, or just gu under LAZY_LOAD_MODELS)
+    try:
+        if LAZY_LOAD_MODELS:
+            logger.info("[TTS] LAZY_LOAD_MODELS set: pre-loading MMS-TTS for gu only")
+            engine.load_mms_tts("gu")
+        else:
             logger.info("[TTS] Pre-loading MMS-TTS models...")
-            _tts_engine.load_mms_tts("gu")
-            _tts_engine.load_mms_tts("mr")
-        except Exception as e:
-            logger.warning(f"[TTS] Failed to pre-load MMS-TTS: {e}")
-        
-        # Warm up GPU if available
-        try:
-            _tts_engine.warmup_gpu()
-        except Exception as e:
-            logger.warning(f"[TTS] GPU warmup failed: {e}")
-        
-        logger.info("[TTS] TTS engine initialized and ready")
-    
-    return _tts_engine
+            engine.load_mms_tts("gu")
+            engine.load_mms_tts("mr")
+    except Exception as e:
+        logger.warning(f"[TTS] Failed to pre-load MMS-TTS: {e}")
+
+    # Warm up GPU if available
+    try:
+        engine.warmup_gpu()
+    except Exception as e:
+        logger.warning(f"[TTS] GPU warmup failed: {e}")
+
+    # Run dummy inferences so the first user request hits steady-state
+    # latency. Under LAZY_LOAD_MODELS warm with Gujarati text: the default
+    # Devanagari sample auto-detects as mr and would force-load the model
+    # lazy mode deliberately defers
+    try:
+        from backend.common.device_utils import warmup_device
+        if LAZY_LOAD_MODELS:
+            warmup_device(engine._infer_mms_tts, sample_text="અ", language="gu")
+        else:
+            warmup_device(engine._infer_mms_tts)
+    except Exception as e:
+        logger.warning(f"[TTS] Device warmup failed: {e}")
+
+    logger.info("[TTS] TTS engine initialized and ready")
+    return engine
 
 
 def validate_language(lang: str) -> Literal["gu", "mr"]:
     """
     Validate language code.
+
+    Deprecated: the Pydantic Literal fields on TTSRequest/WebSocketMessage
+    already enforce this; kept for callers outside the request schemas.
     
     Args:
         lang: Language code to validate
@@ -67,6 +99,9 @@ def validate_language(lang: str) -> Literal["gu", "mr"]:
 def validate_model_choice(model: str) -> Literal["mms", "indic"]:
     """
     Validate model choice.
+
+    Deprecated: the Pydantic Literal fields on TTSRequest/WebSocketMessage
+    already enforce this; kept for callers outside the request schemas.
     
     Args:
         model: Model name to validate
@@ -85,6 +120,8 @@ def validate_model_choice(model: str) -> Literal["mms", "indic"]:
 def map_model_to_engine_type(model: str) -> Literal["mms_tts", "indictts"]:
     """
     Map API model name to engine model type.
+
+    Deprecated: index MODEL_MAP directly on hot paths.
     
     Args:
         model: API model name ('mms', 'indic')
@@ -92,9 +129,5 @@ def map_model_to_engine_type(model: str) -> Literal["mms_tts", "indictts"]:
     Returns:
         Engine model type
     """
-    mapping = {
-        "mms": "mms_tts",
-        "indic": "indictts"
-    }
-    return mapping.get(model, "mms_tts")
+    return MODEL_MAP.get(model, "mms_tts")
 
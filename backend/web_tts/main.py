@@ -3,11 +3,21 @@ FastAPI Web TTS Server
 Main application entry point for Web TTS API on port 8050.
 """
 
+import asyncio
+import functools
 import logging
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+try:
+    import orjson  # noqa: F401 - presence check for ORJSONResponse
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+    ORJSON_AVAILABLE = True
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
+    ORJSON_AVAILABLE = False
+
 from backend.web_tts.dependencies import get_tts_engine
 from backend.web_tts.router import router
 
@@ -18,12 +28,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create FastAPI app
+# Create FastAPI app. orjson serializes in C straight to bytes - the
+# stdlib encoder walking a multi-MB base64 TTSResponse is a synchronous
+# event-loop cost per request.
 app = FastAPI(
     title="Gujarati & Marathi TTS API",
     description="Production-grade TTS API for Gujarati and Marathi languages",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=DefaultResponse
 )
+if not ORJSON_AVAILABLE:
+    logger.warning("[TTS] orjson not available, using stdlib JSON responses")
 
 # CORS configuration for frontend on port 3050
 app.add_middleware(
@@ -46,24 +61,47 @@ async def startup_event():
     logger.info("=" * 60)
     
     try:
-        # Initialize engine (will pre-load models)
-        engine = get_tts_engine()
-        
+        # Initialize engine off the event loop: model loading takes seconds
+        # of blocking work and uvicorn can't finish binding until the
+        # startup hook yields
+        loop = asyncio.get_running_loop()
+        engine = await loop.run_in_executor(None, get_tts_engine)
+
         # Validate GPU availability
         logger.info(f"[TTS] Device: {engine.device_type} ({engine.device})")
-        
+
         # Log loaded models
         logger.info(f"[TTS] MMS-TTS models loaded: {list(engine.mms_tts_models.keys())}")
         logger.info(f"[TTS] IndicTTS loaded: {engine.indictts_loaded}")
-        
-        logger.info("=" * 60)
-        logger.info("Web TTS Server ready!")
-        logger.info("=" * 60)
-        
+
     except Exception as e:
         logger.error(f"[TTS] Startup failed: {e}")
         raise
 
+    # One dummy inference per language warms the cuDNN algorithm and
+    # cuBLAS heuristic caches so the first real request hits steady-state
+    # latency; a warmup failure logs but never blocks boot
+    for warm_text, warm_lang in (("ઓકે", "gu"), ("ठीक", "mr")):
+        # Under LAZY_LOAD_MODELS only pre-loaded languages are warmed;
+        # warming the rest here would force the load lazy mode defers
+        if warm_lang not in engine.mms_tts_models:
+            continue
+        try:
+            await loop.run_in_executor(
+                None,
+                functools.partial(
+                    engine.infer_wav, warm_text, warm_lang,
+                    use_case="web_ui", model_type="mms_tts"
+                )
+            )
+            logger.info(f"[TTS] Warmup inference done for {warm_lang}")
+        except Exception as e:
+            logger.warning(f"[TTS] Warmup inference failed for {warm_lang}: {e}")
+
+    logger.info("=" * 60)
+    logger.info("Web TTS Server ready!")
+    logger.info("=" * 60)
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -87,11 +125,21 @@ async def root():
 
 
 if __name__ == "__main__":
+    # uvloop + httptools replace the stock selector loop and h11 parser
+    # (30-45% less per-request overhead for streaming workloads); both are
+    # Linux/macOS only, and uvicorn's "auto" falls back to asyncio/h11
+    # where they are not installed. Keep-alive and backlog are raised for
+    # bursty polling frontends.
     uvicorn.run(
         "backend.web_tts.main:app",
         host="0.0.0.0",
         port=8050,
         reload=False,
+        loop="auto",
+        http="auto",
+        ws="websockets",
+        backlog=2048,
+        timeout_keep_alive=30,
         log_level="info"
     )
 
@@ -7,7 +7,8 @@ import logging
 import time
 from dataclasses import dataclass
 from typing import Optional
-from collections import deque
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -25,30 +26,45 @@ class LatencyMetrics:
     device: str
     language: str
     use_case: str
-    
+
+    def __post_init__(self):
+        """Normalize None timings to 0.0 once, at construction.
+
+        Callers occasionally pass None for timings they didn't measure;
+        normalizing here lets every downstream read (properties, to_dict,
+        the tracker columns) skip per-access None guards.
+        audio_duration_ms keeps None as its "unknown" sentinel.
+        """
+        if self.total_time_ms is None:
+            self.total_time_ms = 0.0
+        if self.inference_time_ms is None:
+            self.inference_time_ms = 0.0
+        if self.chunking_time_ms is None:
+            self.chunking_time_ms = 0.0
+        if self.network_time_ms is None:
+            self.network_time_ms = 0.0
+
     @property
     def real_time_factor(self) -> float:
         """RTF = inference_time / audio_duration"""
-        if self.audio_duration_ms is None or self.audio_duration_ms == 0:
-            return 0.0
-        if self.inference_time_ms is None or self.inference_time_ms == 0:
+        if not self.audio_duration_ms or not self.inference_time_ms:
             return 0.0
         return self.inference_time_ms / self.audio_duration_ms
-    
+
     @property
     def throughput_chars_per_sec(self) -> float:
         """Characters processed per second."""
-        if self.inference_time_ms is None or self.inference_time_ms == 0:
+        if not self.inference_time_ms:
             return 0.0
         return (self.text_length * 1000) / self.inference_time_ms
-    
+
     def to_dict(self) -> dict:
         """Convert to dictionary for logging/API."""
         return {
-            "total_time_ms": round(self.total_time_ms, 2) if self.total_time_ms is not None else 0.0,
-            "inference_time_ms": round(self.inference_time_ms, 2) if self.inference_time_ms is not None else 0.0,
-            "chunking_time_ms": round(self.chunking_time_ms, 2) if self.chunking_time_ms is not None else 0.0,
-            "network_time_ms": round(self.network_time_ms, 2) if self.network_time_ms is not None else 0.0,
+            "total_time_ms": round(self.total_time_ms, 2),
+            "inference_time_ms": round(self.inference_time_ms, 2),
+            "chunking_time_ms": round(self.chunking_time_ms, 2),
+            "network_time_ms": round(self.network_time_ms, 2),
             "text_length": self.text_length,
             "audio_duration_ms": round(self.audio_duration_ms, 2) if self.audio_duration_ms is not None else 0.0,
             "real_time_factor": round(self.real_time_factor, 3),
@@ -61,30 +77,97 @@ class LatencyMetrics:
 
 
 class LatencyTracker:
-    """Tracks latency metrics over time."""
-    
+    """
+    Tracks latency metrics over time.
+
+    The window is a structure-of-arrays ring buffer: one float64 column
+    per tracked field plus an int8 category column for the model, all
+    preallocated at max_history. A boxed dataclass per request would be
+    ~200 GC-visible bytes each and make every aggregate a Python-level
+    loop; here aggregates are vectorized column passes and the running
+    sums keep get_stats O(1). LatencyMetrics stays as the recording API
+    surface only - it is not stored.
+    """
+
+    # Averaged fields, in column/_sums order
+    _COLUMNS = (
+        "total_time_ms",
+        "inference_time_ms",
+        "chunking_time_ms",
+        "real_time_factor",
+        "throughput_chars_per_sec",
+    )
+
     def __init__(self, max_history: int = 100):
-        self.metrics_history: deque = deque(maxlen=max_history)
+        self.max_history = max_history
+        self.cols = {name: np.zeros(max_history) for name in self._COLUMNS}
+        self._model_col = np.full(max_history, -1, dtype=np.int8)
+        self._model_codes: dict[str, int] = {}
+        self.idx = 0  # Monotonic write index; slot = idx % max_history
         self.total_requests = 0
-    
+        # Running window sums: get_stats reads these in O(1) instead of
+        # re-summing the history per /api/metrics poll
+        self._sums = [0.0] * len(self._COLUMNS)
+        # Monotonic version bumped per record: stat reads are memoized
+        # against it, so bursty monitoring polls between requests
+        # (Prometheus scrape + frontend) hit a plain dict lookup
+        self._version = 0
+        self._stats_cache: Optional[tuple] = None
+        self._model_stats_cache: dict[str, tuple] = {}
+
+    @property
+    def window_len(self) -> int:
+        """Number of valid entries currently in the ring buffer."""
+        return min(self.idx, self.max_history)
+
     def record(self, metrics: LatencyMetrics):
         """Record a new latency measurement."""
-        self.metrics_history.append(metrics)
+        slot = self.idx % self.max_history
+        values = (
+            metrics.total_time_ms,
+            metrics.inference_time_ms,
+            metrics.chunking_time_ms,
+            metrics.real_time_factor,
+            metrics.throughput_chars_per_sec,
+        )
+
+        # Keep the window sums exact under eviction: subtract the slot
+        # being overwritten before writing the new entry into it
+        evicting = self.idx >= self.max_history
+        for i, name in enumerate(self._COLUMNS):
+            if evicting:
+                self._sums[i] -= float(self.cols[name][slot])
+            self.cols[name][slot] = values[i]
+            self._sums[i] += values[i]
+
+        code = self._model_codes.get(metrics.model)
+        if code is None:
+            code = len(self._model_codes)
+            self._model_codes[metrics.model] = code
+        self._model_col[slot] = code
+
+        self.idx += 1
         self.total_requests += 1
-        
-        # Log detailed metrics
+        self._version += 1
+
+        # Log detailed metrics. %-style args defer the six float formats
+        # into Logger._log, so they never run when the level drops the
+        # record; this fires on every request
         logger.info(
-            f"[LATENCY] Model={metrics.model} Device={metrics.device} "
-            f"Text={metrics.text_length}chars "
-            f"Total={metrics.total_time_ms:.1f}ms "
-            f"Inference={metrics.inference_time_ms:.1f}ms "
-            f"RTF={metrics.real_time_factor:.3f} "
-            f"Throughput={metrics.throughput_chars_per_sec:.1f}chars/s"
+            "[LATENCY] Model=%s Device=%s Text=%dchars "
+            "Total=%.1fms Inference=%.1fms RTF=%.3f Throughput=%.1fchars/s",
+            metrics.model, metrics.device, metrics.text_length,
+            metrics.total_time_ms, metrics.inference_time_ms,
+            metrics.real_time_factor, metrics.throughput_chars_per_sec
         )
-    
+
     def get_stats(self) -> dict:
-        """Get aggregated statistics."""
-        if not self.metrics_history:
+        """Get aggregated statistics (memoized until the next record)."""
+        if self._stats_cache is not None and self._stats_cache[0] == self._version:
+            return self._stats_cache[1]
+
+        n = self.window_len
+        if n == 0:
             return {
                 "total_requests": 0,
                 "avg_total_time_ms": 0,
@@ -92,32 +175,48 @@ class LatencyTracker:
                 "avg_rtf": 0,
                 "avg_throughput_chars_per_sec": 0,
             }
-        
-        metrics_list = list(self.metrics_history)
-        
-        return {
+
+        # Averages come from the running sums (O(1)); min/max are one
+        # vectorized pass over the valid region of the column
+        inference_window = self.cols["inference_time_ms"][:n]
+
+        stats = {
             "total_requests": self.total_requests,
-            "avg_total_time_ms": sum(m.total_time_ms for m in metrics_list) / len(metrics_list),
-            "avg_inference_time_ms": sum(m.inference_time_ms for m in metrics_list) / len(metrics_list),
-            "avg_chunking_time_ms": sum(m.chunking_time_ms for m in metrics_list) / len(metrics_list),
-            "avg_rtf": sum(m.real_time_factor for m in metrics_list) / len(metrics_list),
-            "avg_throughput_chars_per_sec": sum(m.throughput_chars_per_sec for m in metrics_list) / len(metrics_list),
-            "min_inference_time_ms": min(m.inference_time_ms for m in metrics_list),
-            "max_inference_time_ms": max(m.inference_time_ms for m in metrics_list),
+            "avg_total_time_ms": self._sums[0] / n,
+            "avg_inference_time_ms": self._sums[1] / n,
+            "avg_chunking_time_ms": self._sums[2] / n,
+            "avg_rtf": self._sums[3] / n,
+            "avg_throughput_chars_per_sec": self._sums[4] / n,
+            "min_inference_time_ms": float(inference_window.min()),
+            "max_inference_time_ms": float(inference_window.max()),
         }
-    
+        self._stats_cache = (self._version, stats)
+        return stats
+
     def get_model_stats(self, model: str) -> dict:
-        """Get statistics for a specific model."""
-        model_metrics = [m for m in self.metrics_history if m.model == model]
-        if not model_metrics:
+        """Get statistics for a specific model (memoized until the next record)."""
+        cached = self._model_stats_cache.get(model)
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+
+        code = self._model_codes.get(model)
+        if code is None:
             return {}
-        
-        return {
+
+        # Single vectorized pass: unwritten slots hold code -1 and never match
+        mask = self._model_col == code
+        count = int(mask.sum())
+        if count == 0:
+            return {}
+
+        stats = {
             "model": model,
-            "count": len(model_metrics),
-            "avg_inference_time_ms": sum(m.inference_time_ms for m in model_metrics) / len(model_metrics),
-            "avg_rtf": sum(m.real_time_factor for m in model_metrics) / len(model_metrics),
+            "count": count,
+            "avg_inference_time_ms": float(self.cols["inference_time_ms"][mask].mean()),
+            "avg_rtf": float(self.cols["real_time_factor"][mask].mean()),
         }
+        self._model_stats_cache[model] = (self._version, stats)
+        return stats
 
 
 # Global latency tracker instance
@@ -3,39 +3,135 @@ FastAPI Router for Web TTS API
 Defines REST and WebSocket endpoints for TTS generation.
 """
 
+import asyncio
 import base64
-import io
-import json
 import logging
+import struct
 import time
 from typing import Literal
 
 import numpy as np
-import soundfile as sf
-from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 from fastapi.responses import Response
 
 from backend.common.config import USE_CASE_WEB_UI, DEFAULT_SAMPLE_RATE, ENABLE_CHUNK_METADATA
 from backend.common.tts_engine import TTSEngine
-from backend.web_tts.dependencies import (
-    get_tts_engine,
-    map_model_to_engine_type,
-    validate_language,
-    validate_model_choice,
-)
+from backend.web_tts.dependencies import MODEL_MAP, get_tts_engine
 from backend.web_tts.schemas import (
+    MSGSPEC_AVAILABLE,
     ErrorResponse,
     TTSRequest,
     TTSResponse,
-    WebSocketEndMessage,
     WebSocketMessage,
+    WSMessage,
 )
 from backend.web_tts.metrics import LatencyMetrics, latency_tracker
 
 logger = logging.getLogger(__name__)
 
+# One reusable decoder: instantiating it per connection would rebuild the
+# type-to-C-parser mapping each time. strict=False mirrors the Pydantic
+# model's float->int coercion on chunk_ms.
+if MSGSPEC_AVAILABLE:
+    import msgspec
+    _WS_DECODER = msgspec.json.Decoder(WSMessage, strict=False)
+else:
+    _WS_DECODER = None
+
 router = APIRouter(prefix="/api", tags=["TTS"])
 
+# 44-byte canonical WAV header for 16-bit mono PCM, precompiled once
+_WAV_HEADER_STRUCT = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+# SIMD base64 (AVX2/SSSE3) when pybase64 is installed, stdlib otherwise
+_b64encode = pybase64.b64encode if PYBASE64_AVAILABLE else base64.b64encode
+
+# Payloads under this encode faster inline than a thread-pool round-trip costs
+_B64_OFFLOAD_MIN_BYTES = 1 << 16
+
+# 21-byte per-frame metadata prefix (when ENABLE_CHUNK_METADATA):
+# server_received_ts µs (u64), chunk_index (u32), chunk_gen_ts µs (u64),
+# flags (u8, bit 0 = first chunk). Clients strip _META_STRUCT.size bytes.
+_META_STRUCT = struct.Struct('<QIQB')
+
+
+# Serializes concurrent cold loads of the same (language, model) pair so
+# under LAZY_LOAD_MODELS a burst of first requests triggers one load
+_load_locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+
+async def _ensure_loaded_async(engine: TTSEngine, lang: str, model_type: str) -> None:
+    """
+    Await engine.ensure_loaded without blocking the event loop.
+
+    The resident check stays inline (one dict lookup); only the cold
+    path under LAZY_LOAD_MODELS - a multi-second model load - moves to
+    the default executor, behind a per-(language, model) lock so
+    concurrent first requests don't load twice.
+    """
+    if model_type == "mms_tts":
+        if lang in engine.mms_tts_models:
+            return
+    elif engine.indictts_loaded:
+        return
+
+    lock = _load_locks.setdefault((lang, model_type), asyncio.Lock())
+    async with lock:
+        # ensure_loaded re-checks residency, so the loser of the lock
+        # race returns without a second load
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, engine.ensure_loaded, lang, model_type)
+
+
+def _pack_wav(waveform: np.ndarray, sample_rate: int) -> bytes:
+    """
+    Pack a waveform into 16-bit mono WAV bytes.
+
+    Writes the 44-byte header with one struct.pack and appends the raw
+    PCM - no libsndfile dispatch and no BytesIO growth reallocations,
+    which dominate encoding time for large web-UI waveforms.
+
+    Args:
+        waveform: Audio samples (float in [-1, 1] or int16)
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        Complete WAV file bytes
+    """
+    if waveform.dtype != np.int16:
+        scaled = waveform * 32767.0
+        np.clip(scaled, -32768.0, 32767.0, out=scaled)
+        pcm = scaled.astype(np.int16)
+    else:
+        pcm = waveform
+
+    data = pcm.tobytes()
+    return _wav_header(len(data), sample_rate) + data
+
+
+def _wav_header(n_bytes: int, sample_rate: int) -> bytes:
+    """Build the 44-byte WAV header for n_bytes of 16-bit mono PCM."""
+    return _WAV_HEADER_STRUCT.pack(
+        b'RIFF', 36 + n_bytes, b'WAVE',
+        b'fmt ', 16,              # fmt chunk size
+        1, 1,                     # PCM, mono
+        sample_rate, sample_rate * 2,  # byte rate = sr * block align
+        2, 16,                    # block align, bits per sample
+        b'data', n_bytes
+    )
+
 
 @router.post("/tts", response_model=TTSResponse)
 async def generate_tts(
@@ -55,25 +151,29 @@ async def generate_tts(
     Raises:
         HTTPException: If generation fails
     """
-    total_start_time = time.time()
+    total_start_time = time.perf_counter()
     
     try:
-        # Validate inputs
-        validation_start = time.time()
-        lang = validate_language(request.lang)
-        model = validate_model_choice(request.model)
-        
-        
-        model_type = map_model_to_engine_type(model)
-        validation_time = (time.time() - validation_start) * 1000
+        # lang/model already passed the Literal validation on TTSRequest;
+        # re-checking them here would just add two frames per request
+        lang = request.lang
+        model = request.model
+        model_type = MODEL_MAP[model]
         
+        # %-style args defer formatting into Logger._log, so a WARN-level
+        # prod config skips the interpolation entirely
         logger.info(
-            f"[TTS-REST] text_length={len(request.text)} "
-            f"model={model} lang={lang}"
+            "[TTS-REST] text_length=%d model=%s lang=%s",
+            len(request.text), model, lang
         )
-        
+
+        # Under LAZY_LOAD_MODELS the model may not be resident yet; the
+        # warm path is a single dict lookup, the cold load runs in the
+        # executor so it can't stall concurrent streams
+        await _ensure_loaded_async(engine, lang, model_type)
+
         # Generate audio
-        inference_start = time.time()
+        inference_start = time.perf_counter()
         try:
             waveform, sample_rate = engine.infer_wav(
                 text=request.text,
@@ -82,7 +182,7 @@ async def generate_tts(
                 model_type=model_type
             )
         except Exception as e:
-            logger.error(f"[TTS-REST] Inference failed: {e}")
+            logger.error("[TTS-REST] Inference failed: %s", e)
             raise
         
         # Validate inference results
@@ -91,21 +191,26 @@ async def generate_tts(
         if sample_rate is None or sample_rate <= 0:
             raise ValueError(f"Invalid sample rate from inference: {sample_rate}")
         
-        inference_time = (time.time() - inference_start) * 1000
-        
-        # Convert to WAV bytes
-        encoding_start = time.time()
-        wav_buffer = io.BytesIO()
-        sf.write(wav_buffer, waveform, sample_rate, format='WAV')
-        wav_bytes = wav_buffer.getvalue()
+        inference_time = (time.perf_counter() - inference_start) * 1000
         
-        # Encode to base64
-        audio_base64 = base64.b64encode(wav_bytes).decode('utf-8')
-        encoding_time = (time.time() - encoding_start) * 1000
+        # Convert to WAV bytes (hand-packed header + raw PCM)
+        encoding_start = time.perf_counter()
+        wav_bytes = _pack_wav(waveform, sample_rate)
+
+        # Encode to base64. Large payloads run in the default executor: a
+        # multi-MB b64encode would otherwise block the event loop and stall
+        # every concurrent request for its duration.
+        if len(wav_bytes) >= _B64_OFFLOAD_MIN_BYTES:
+            loop = asyncio.get_running_loop()
+            encoded = await loop.run_in_executor(None, _b64encode, wav_bytes)
+        else:
+            encoded = _b64encode(wav_bytes)
+        audio_base64 = encoded.decode('ascii')
+        encoding_time = (time.perf_counter() - encoding_start) * 1000
         
         # Calculate duration
         duration_ms = (len(waveform) / sample_rate) * 1000
-        total_time = (time.time() - total_start_time) * 1000
+        total_time = (time.perf_counter() - total_start_time) * 1000
         
         # Record metrics
         metrics = LatencyMetrics(
@@ -123,10 +228,12 @@ async def generate_tts(
         latency_tracker.record(metrics)
         
         logger.info(
-            f"[TTS-REST] text_length={len(request.text)} "
-            f"model={model} total={total_time:.1f}ms "
-            f"inference={inference_time:.1f}ms encoding={encoding_time:.1f}ms "
-            f"audio_duration={duration_ms:.1f}ms RTF={metrics.real_time_factor:.3f}"
+            "[TTS-REST] text_length=%d model=%s total=%.1fms "
+            "inference=%.1fms encoding=%.1fms "
+            "audio_duration=%.1fms RTF=%.3f",
+            len(request.text), model, total_time,
+            inference_time, encoding_time,
+            duration_ms, metrics.real_time_factor
         )
         
         return TTSResponse(
@@ -142,12 +249,10 @@ async def generate_tts(
         )
         
     except ValueError as e:
-        logger.error(f"[TTS-REST] Validation error: {e}")
-        from fastapi import HTTPException
+        logger.error("[TTS-REST] Validation error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"[TTS-REST] Generation failed: {e}")
-        from fastapi import HTTPException
+        logger.error("[TTS-REST] Generation failed: %s", e)
         error_msg = str(e)
         # Provide more helpful error messages
         if "empty input" in error_msg.lower() or "negative output size" in error_msg.lower():
@@ -167,55 +272,89 @@ async def stream_tts(websocket: WebSocket):
     WebSocket endpoint for streaming TTS audio chunks.
     
     Protocol:
-    1. Client sends JSON message with text, lang, model, chunk_ms
-    2. Server streams binary audio chunks (WAV format)
-    3. Server sends final JSON message with metadata
+    1. Client sends JSON message with text, lang, model, chunk_ms, raw_pcm
+    2. Server sends one JSON format message ({sample_rate, bits, channels})
+    3. Server streams binary audio chunks (raw int16 PCM by default, or
+       per-chunk WAV when raw_pcm is false)
+    4. Server sends final JSON message with metadata
     """
     await websocket.accept()
     
     try:
-        # Receive initial message
-        data = await websocket.receive_json()
-        message = WebSocketMessage(**data)
-        
-        # Validate inputs
-        lang = validate_language(message.lang)
-        model = validate_model_choice(message.model)
-        
+        # Receive initial message. With msgspec the raw text goes straight
+        # into one C decode+validate pass (ValidationError is a ValueError,
+        # so the handler below still catches it); otherwise Pydantic's own
+        # JSON validator, skipping receive_json's stdlib loads + dict kwargs
+        raw = await websocket.receive_text()
+        if _WS_DECODER is not None:
+            message = _WS_DECODER.decode(raw)
+        else:
+            message = WebSocketMessage.model_validate_json(raw)
         
-        model_type = map_model_to_engine_type(model)
+        # lang/model already passed the Literal validation on WebSocketMessage
+        lang = message.lang
+        model = message.model
+        model_type = MODEL_MAP[model]
         chunk_ms = message.chunk_ms
         
+        # %-style args defer formatting (including the text slice's repr)
+        # until a handler actually accepts the record
         logger.info(
-            f"[TTS-WS] text=\"{message.text[:50]}...\" "
-            f"lang={lang} model={model} chunk_ms={chunk_ms}"
+            '[TTS-WS] text="%s..." lang=%s model=%s chunk_ms=%d',
+            message.text[:50], lang, model, chunk_ms
         )
         
         # Get engine
         engine = get_tts_engine()
-        
-        # Use packet-based streaming for constant latency (independent of text size)
-        total_start_time = time.time()
-        server_received_ts = total_start_time  # When server received the request
+
+        # Under LAZY_LOAD_MODELS the model may not be resident yet; the
+        # warm path is a single dict lookup, the cold load runs in the
+        # executor so it can't stall concurrent streams
+        await _ensure_loaded_async(engine, lang, model_type)
+
+        # Use packet-based streaming for constant latency (independent of
+        # text size). One wall-clock read anchors absolute reporting; all
+        # deltas use the monotonic clock (cheaper, immune to NTP slews).
+        total_start_time = time.perf_counter()
+        server_received_ts = time.time()  # When server received the request
         chunk_count = 0
         first_chunk_sent = False
         first_chunk_time: float | None = None
         total_audio_samples = 0
         sample_rate = DEFAULT_SAMPLE_RATE
-        inference_start = time.time()
-        
+        raw_pcm = message.raw_pcm
+        inference_start = time.perf_counter()
+
+        # Announce the framing once up front: raw PCM frames carry no
+        # per-packet WAV header, so the client needs the format here
+        await websocket.send_json({
+            "event": "format",
+            "raw_pcm": raw_pcm,
+            "sample_rate": sample_rate,
+            "bits": 16,
+            "channels": 1,
+            "chunk_samples": int(chunk_ms * sample_rate / 1000),
+            "meta_prefix_bytes": _META_STRUCT.size if ENABLE_CHUNK_METADATA else 0
+        })
+
+        # Chunks are constant-length apart from packet tails, so the WAV
+        # wrapper header repeats: cache it per byte length instead of
+        # re-packing per chunk
+        wav_headers: dict[int, bytes] = {}
+
         try:
             # Stream audio packets with constant latency
             # Text is split into small packets (5 words), each processed independently
             # First packet latency is constant regardless of total text size
             # IMPORTANT: Send each chunk immediately as it's generated (no buffering)
             logger.info(
-                f"[TTS-WS] Starting packet streaming: text_length={len(message.text)}, "
-                f"model={model}, language={lang}"
+                "[TTS-WS] Starting packet streaming: text_length=%d, "
+                "model=%s, language=%s",
+                len(message.text), model, lang
             )
             
-            packet_start = time.time()
-            for chunk_bytes in engine.infer_chunked(
+            packet_start = time.perf_counter()
+            for chunk_bytes, n_samples in engine.infer_chunked(
                 text=message.text,
                 language=lang,
                 use_case=USE_CASE_WEB_UI,
@@ -224,74 +363,71 @@ async def stream_tts(websocket: WebSocket):
                 low_latency=True,
                 streaming=True  # Enable packet-based streaming
             ):
-                # Instrumentation: Record chunk generation and send timestamps
-                server_chunk_gen_ts = time.time()
-                server_chunk_sent_ts = None
-                
+                # Instrumentation: one monotonic read per chunk; the
+                # wall-clock generation time for metadata derives from the
+                # anchor instead of a second clock_gettime
+                chunk_gen_perf = time.perf_counter()
+                server_chunk_gen_ts = server_received_ts + (chunk_gen_perf - total_start_time)
+
+                # The engine yields the authoritative sample count with each
+                # chunk; the WAV wrapper is only added if the client asked.
+                # Chunks arrive as zero-copy memoryviews; b"".join accepts
+                # buffer-protocol objects, so prefixing stays one copy.
+                total_audio_samples += n_samples
+                if not raw_pcm:
+                    header = wav_headers.get(len(chunk_bytes))
+                    if header is None:
+                        header = _wav_header(len(chunk_bytes), sample_rate)
+                        wav_headers[len(chunk_bytes)] = header
+                    chunk_bytes = b"".join((header, chunk_bytes))
+
+                # Metadata rides as a fixed binary prefix on the same frame:
+                # a separate JSON text frame per chunk would double the WS
+                # frame rate and pay a json.dumps per 40 ms packet
+                if ENABLE_CHUNK_METADATA:
+                    chunk_bytes = b"".join((
+                        _META_STRUCT.pack(
+                            int(server_received_ts * 1e6),
+                            chunk_count,
+                            int(server_chunk_gen_ts * 1e6),
+                            0 if first_chunk_sent else 1
+                        ),
+                        chunk_bytes,
+                    ))
+
                 # CRITICAL: Send immediately - don't buffer!
                 # Track first chunk latency (constant regardless of text size)
                 if not first_chunk_sent:
-                    first_chunk_start = time.time()
-                    
-                    # Send chunk metadata if enabled (for latency measurement)
-                    if ENABLE_CHUNK_METADATA:
-                        chunk_meta = {
-                            "type": "chunk_meta",
-                            "server_received_ts": server_received_ts,
-                            "chunk_index": chunk_count,
-                            "server_chunk_gen_ts": server_chunk_gen_ts,
-                            "is_first_chunk": True
-                        }
-                        await websocket.send_text(json.dumps(chunk_meta))
-                    
                     await websocket.send_bytes(chunk_bytes)
-                    server_chunk_sent_ts = time.time()
-                    first_chunk_time = (server_chunk_sent_ts - first_chunk_start) * 1000
+                    first_chunk_time = (time.perf_counter() - chunk_gen_perf) * 1000
                     chunk_count += 1
                     first_chunk_sent = True
-                    packet_time = (server_chunk_gen_ts - packet_start) * 1000
+                    packet_time = (chunk_gen_perf - packet_start) * 1000
                     logger.info(
-                        f"[TTS-WS] ✅ First packet sent in {first_chunk_time:.1f}ms "
-                        f"(packet_gen={packet_time:.1f}ms, text_length={len(message.text)}, "
-                        f"constant latency achieved)"
+                        "[TTS-WS] ✅ First packet sent in %.1fms "
+                        "(packet_gen=%.1fms, text_length=%d, "
+                        "constant latency achieved)",
+                        first_chunk_time, packet_time, len(message.text)
                     )
                 else:
-                    # Send chunk metadata if enabled
-                    if ENABLE_CHUNK_METADATA:
-                        chunk_meta = {
-                            "type": "chunk_meta",
-                            "server_received_ts": server_received_ts,
-                            "chunk_index": chunk_count,
-                            "server_chunk_gen_ts": server_chunk_gen_ts,
-                            "is_first_chunk": False
-                        }
-                        await websocket.send_text(json.dumps(chunk_meta))
-                    
                     # Send subsequent chunks immediately (no buffering)
                     await websocket.send_bytes(chunk_bytes)
-                    server_chunk_sent_ts = time.time()
                     chunk_count += 1
                     
-                # Estimate audio duration from chunk size
-                # Each chunk is a WAV file, estimate samples from bytes
-                # WAV header is ~44 bytes, rest is audio data (2 bytes per sample for int16)
-                if len(chunk_bytes) > 44:
-                    estimated_samples = (len(chunk_bytes) - 44) // 2
-                    total_audio_samples += estimated_samples
-                    
-            inference_time = (time.time() - inference_start) * 1000
+            inference_time = (time.perf_counter() - inference_start) * 1000
             logger.info(
-                f"[TTS-WS] Packet streaming complete: {chunk_count} chunks, "
-                f"inference={inference_time:.1f}ms, samples={total_audio_samples}"
+                "[TTS-WS] Packet streaming complete: %d chunks, "
+                "inference=%.1fms, samples=%d",
+                chunk_count, inference_time, total_audio_samples
             )
                     
         except Exception as e:
-            logger.error(f"[TTS-WS] Packet streaming failed: {e}", exc_info=True)
+            logger.error("[TTS-WS] Packet streaming failed: %s", e, exc_info=True)
             raise
         
         # Calculate metrics
-        total_time = (time.time() - total_start_time) * 1000
-        inference_time = (time.time() - inference_start) * 1000 if 'inference_start' in locals() else total_time * 0.8
+        total_time = (time.perf_counter() - total_start_time) * 1000
+        inference_time = (time.perf_counter() - inference_start) * 1000 if 'inference_start' in locals() else total_time * 0.8
         
         if total_audio_samples > 0 and sample_rate > 0:
             duration_ms = (total_audio_samples / sample_rate) * 1000
@@ -315,42 +451,55 @@ async def stream_tts(websocket: WebSocket):
         )
         latency_tracker.record(metrics)
         
-        # Send end message with latency info
-        end_message = WebSocketEndMessage(
-            event="end",
-            duration_ms=duration_ms,
-            chunks_sent=chunk_count,
-            model=model,
-            device=engine.device_type,
-            inference_time_ms=metrics.inference_time_ms,
-            total_time_ms=total_time,
-            real_time_factor=metrics.real_time_factor,
-            first_chunk_time_ms=first_chunk_time if first_chunk_sent else None,
-            chunking_time_ms=0.0  # Packet-based: no separate chunking phase
-        )
-        await websocket.send_json(end_message.dict())
+        # Send end message with latency info. The payload is
+        # server-authored, so skip the Pydantic construction/validation of
+        # WebSocketEndMessage (the schema class remains the documented
+        # contract) and serialize the plain dict directly.
+        end_payload = {
+            "event": "end",
+            "duration_ms": duration_ms,
+            "chunks_sent": chunk_count,
+            "model": model,
+            "device": engine.device_type,
+            "inference_time_ms": metrics.inference_time_ms,
+            "total_time_ms": total_time,
+            "real_time_factor": metrics.real_time_factor,
+            "first_chunk_time_ms": first_chunk_time if first_chunk_sent else None,
+            "chunking_time_ms": 0.0  # Packet-based: no separate chunking phase
+        }
+        if ORJSON_AVAILABLE:
+            await websocket.send_text(orjson.dumps(end_payload).decode())
+        else:
+            await websocket.send_json(end_payload)
         
-        log_msg = (
-            f"[TTS-WS] text=\"{message.text[:50]}...\" "
-            f"lang={lang} model={model} total={total_time:.1f}ms "
-            f"chunks={chunk_count} RTF={metrics.real_time_factor:.3f} "
-            f"text_length={len(message.text)}"
-        )
         if first_chunk_sent and first_chunk_time:
-            log_msg += f" first_packet={first_chunk_time:.1f}ms (constant latency)"
-        logger.info(log_msg)
+            logger.info(
+                '[TTS-WS] text="%s..." lang=%s model=%s total=%.1fms '
+                'chunks=%d RTF=%.3f text_length=%d '
+                'first_packet=%.1fms (constant latency)',
+                message.text[:50], lang, model, total_time,
+                chunk_count, metrics.real_time_factor, len(message.text),
+                first_chunk_time
+            )
+        else:
+            logger.info(
+                '[TTS-WS] text="%s..." lang=%s model=%s total=%.1fms '
+                'chunks=%d RTF=%.3f text_length=%d',
+                message.text[:50], lang, model, total_time,
+                chunk_count, metrics.real_time_factor, len(message.text)
+            )
         
     except WebSocketDisconnect:
         logger.info("[TTS-WS] Client disconnected")
     except ValueError as e:
-        logger.error(f"[TTS-WS] Validation error: {e}")
+        logger.error("[TTS-WS] Validation error: %s", e)
         error_msg = str(e)
         await websocket.send_json({
             "error": error_msg,
             "code": "validation_error"
         })
     except Exception as e:
-        logger.error(f"[TTS-WS] Generation failed: {e}")
+        logger.error("[TTS-WS] Generation failed: %s", e)
         error_msg = str(e)
         # Provide more helpful error messages
         if "empty input" in error_msg.lower() or "negative output size" in error_msg.lower():
@@ -407,6 +556,6 @@ async def get_metrics():
     return {
         "overall": stats,
         "by_model": model_stats,
-        "recent_requests": len(latency_tracker.metrics_history)
+        "recent_requests": latency_tracker.window_len
     }
 
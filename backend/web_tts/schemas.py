@@ -4,10 +4,17 @@ Defines request and response models for REST and WebSocket endpoints.
 """
 
 import base64
-from typing import Literal
+from typing import Annotated, Literal
 
 from pydantic import BaseModel, Field, field_validator
 
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    msgspec = None
+    MSGSPEC_AVAILABLE = False
+
 
 class TTSRequest(BaseModel):
     """REST API request model for TTS generation."""
@@ -63,7 +70,12 @@ class WebSocketMessage(BaseModel):
         ge=20,
         le=100
     )
-    
+    raw_pcm: bool = Field(
+        default=True,
+        description="Stream raw int16 PCM frames (format announced once at start); "
+                    "if false, each frame is wrapped in a WAV header"
+    )
+
     @field_validator('chunk_ms', mode='before')
     @classmethod
     def coerce_chunk_ms(cls, v):
@@ -73,6 +85,25 @@ class WebSocketMessage(BaseModel):
         return v
 
 
+if MSGSPEC_AVAILABLE:
+    class WSMessage(msgspec.Struct):
+        """msgspec twin of WebSocketMessage for the WebSocket hot path.
+
+        msgspec decodes and validates the handshake in one C pass,
+        several times faster than json.loads + Pydantic for this small
+        fixed shape. Field set and constraints must stay in sync with
+        WebSocketMessage, which remains the documented OpenAPI contract
+        and the fallback parser when msgspec is not installed.
+        """
+        text: Annotated[str, msgspec.Meta(min_length=1)]
+        lang: Literal["gu", "mr"]
+        model: Literal["mms", "indic"] = "mms"
+        chunk_ms: Annotated[int, msgspec.Meta(ge=20, le=100)] = 40
+        raw_pcm: bool = True
+else:
+    WSMessage = None
+
+
 class WebSocketEndMessage(BaseModel):
     """WebSocket end message model."""
     